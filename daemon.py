@@ -0,0 +1,205 @@
+import asyncio
+import importlib
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "telegram_bot"))   # listener / poster
+from empire import telemetry
+from empire.schedule import Trigger
+
+# --- 1. SCHEDULE (UTC, cron syntax) ---
+# One resident process runs every engine: modules are imported once, and the Gemini client, the pooled
+# HTTP session, the LinkedIn identity and the Telegram connection stay warm between cycles.
+SCHEDULE = {
+    "news": os.environ.get("DAEMON_NEWS_CRON", "0 8,17 * * *"),
+    "visual": os.environ.get("DAEMON_VISUAL_CRON", "30 12 * * *"),
+    "jobs": os.environ.get("DAEMON_JOBS_CRON", "0 */6 * * *"),
+    "drain": os.environ.get("DAEMON_DRAIN_CRON", "17 * * * *"),
+}
+DAEMON_CYCLES = [c.strip() for c in os.environ.get("DAEMON_CYCLES", ",".join(SCHEDULE)).split(",") if c.strip()]
+DAEMON_JITTER_MINUTES = float(os.environ.get("DAEMON_JITTER_MINUTES", "10"))   # random delay after each trigger
+DAEMON_SHUTDOWN_GRACE = float(os.environ.get("DAEMON_SHUTDOWN_GRACE", "300"))   # seconds a running cycle may finish in
+POST_BATCH_SIZE = int(os.environ.get("POST_BATCH_SIZE", "4"))
+
+# Engines each cycle needs; an engine is imported (and its keys checked) only if a selected cycle uses it.
+ENGINES = {"news": ["main"], "visual": ["main_empire"], "jobs": ["listener", "poster"], "drain": ["poster"]}
+
+def log(message):
+    print(f"[{datetime.now(timezone.utc):%Y-%m-%d %H:%M:%S}] {message}", flush=True)
+
+# --- 2. THE RESIDENT ---
+class Daemon:
+    def __init__(self, cycles=DAEMON_CYCLES, jitter_minutes=DAEMON_JITTER_MINUTES):
+        unknown = [c for c in cycles if c not in SCHEDULE]
+        if unknown:
+            raise ValueError(f"Unknown cycle(s) {unknown}. Choose from {sorted(SCHEDULE)}.")
+        self.cycles = list(cycles)
+        self.triggers = {name: Trigger(SCHEDULE[name], jitter_minutes * 60) for name in self.cycles}
+        self.engines = {}
+        self.telegram = None
+        self.accounts = None   # with accounts.json, every cycle fans out to these
+        self.running = {}
+        self.stopping = None   # created on the running loop (Python 3.9 binds events to the loop at creation)
+
+    async def warm(self):
+        """Imports the engines and opens every long-lived client once, before the first cycle."""
+        started = time.perf_counter()
+        for module in dict.fromkeys(m for c in self.cycles for m in ENGINES[c]):
+            try:
+                self.engines[module] = importlib.import_module(module)
+            except SystemExit as e:   # the engines exit at import when their keys are missing
+                raise RuntimeError(f"Cannot load {module}.py ({e.code}). Check its keys or drop its cycles from DAEMON_CYCLES.")
+
+        from empire.llm import get_gateway
+        from empire.linkedin import get_publisher, LinkedInError
+        from empire.accounts import accounts_configured
+        await asyncio.to_thread(lambda: get_gateway().client)   # the SDK import and client build, paid once
+        if accounts_configured():
+            self.accounts = await asyncio.to_thread(self._warm_accounts)
+        else:
+            try:
+                await asyncio.to_thread(get_publisher().get_urn)      # the identity, cached for every later post
+            except LinkedInError as e:
+                raise RuntimeError(f"LinkedIn auth failed: {e}")
+        if "listener" in self.engines:
+            self.telegram = self.engines["listener"].make_client()
+            await self.telegram.start()
+        log(f"🔥 Warm in {time.perf_counter() - started:.1f}s: {', '.join(self.engines)}")
+
+    def _warm_accounts(self):
+        """Each account's identity, fetched once. An account whose token is rejected is left out; none left is fatal."""
+        from empire.linkedin import LinkedInError
+        from empire.accounts import load_accounts
+        accounts = []
+        for account in load_accounts():
+            try:
+                account.publisher.get_urn()
+                accounts.append(account)
+            except LinkedInError as e:
+                log(f"⚠️ Account '{account.name}': LinkedIn auth failed ({e}). Leaving it out.")
+        if not accounts:
+            raise RuntimeError("No account in accounts.json could authenticate with LinkedIn.")
+        log(f"👥 Accounts: {', '.join(a.name for a in accounts)}")
+        return accounts
+
+    def _for(self, engine):
+        """The warm accounts that run `engine`, or None when there is no accounts.json."""
+        return None if self.accounts is None else [a for a in self.accounts if engine in a.engines]
+
+    # --- Cycles (only the network work is left per run) ---
+    def _news(self):
+        accounts = self._for("news")
+        if accounts is None:
+            self.engines["main"].build_news_pipeline().run()
+        elif accounts:
+            self.engines["main"].build_fanout_pipeline(accounts).run(max_workers=len(accounts) + 2)
+
+    def _visual(self):
+        engine = self.engines["main_empire"]
+        if engine._market is not None:
+            engine._market.synced.clear()   # per-process flag; every cycle brings the bars up to date again
+        accounts = self._for("visual")
+        if accounts is None:
+            engine.build_visual_pipeline().run()
+        elif accounts:
+            engine.build_visual_fanout_pipeline(accounts).run(max_workers=3 * len(accounts) + 2)
+        made = engine.get_art_pool().fill(engine.all_art_prompts())
+        print(f"🎨 Art pool refilled with {made} new images.")
+
+    async def _jobs(self):
+        await self.engines["listener"].main(client=self.telegram)
+        poster = self.engines["poster"]
+        accounts = self._for("jobs")
+        if accounts is None:
+            await asyncio.to_thread(poster.run_batch, POST_BATCH_SIZE)
+        else:
+            await asyncio.to_thread(poster.run_batch_accounts, POST_BATCH_SIZE, accounts)
+        await self._drain()
+
+    async def _drain(self):
+        poster = self.engines["poster"]
+        accounts = self._for("jobs")
+        if accounts is None:
+            await asyncio.to_thread(poster.run_drain)
+        else:
+            await asyncio.to_thread(poster.run_drain_accounts, accounts)
+
+    async def run_cycle(self, name):
+        log(f"▶️ {name} cycle starting")
+        started = time.perf_counter()
+        from empire.llm import new_scope
+        new_scope()   # this cycle's task only: cached copy is for retries within a cycle, never reused by the next one
+        try:
+            with telemetry.span(f"daemon.{name}"):
+                if name in ("news", "visual"):
+                    await asyncio.to_thread(getattr(self, f"_{name}"))   # blocking pipelines run off the loop
+                else:
+                    await getattr(self, f"_{name}")()
+            log(f"✅ {name} cycle done in {time.perf_counter() - started:.1f}s")
+        except SystemExit as e:
+            # The engines end a run with sys.exit(); only a non-zero code is a failure
+            outcome = "done" if e.code in (0, None) else f"stopped ({e.code})"
+            log(f"{'✅' if e.code in (0, None) else '❌'} {name} cycle {outcome} after {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            log(f"❌ {name} cycle failed: {type(e).__name__}: {e}")
+        finally:
+            telemetry.flush()
+
+    async def schedule(self, name):
+        trigger = self.triggers[name]
+        while not self.stopping.is_set():
+            fire = trigger.next_fire()
+            log(f"⏰ {name}: next run at {fire:%Y-%m-%d %H:%M:%S} UTC")
+            delay = (fire - datetime.now(timezone.utc)).total_seconds()
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=max(delay, 0))
+                return   # stopping
+            except asyncio.TimeoutError:
+                pass
+            if name in self.running:
+                log(f"⏭️ {name}: previous run still going. Skipping this trigger.")
+                continue
+            task = asyncio.create_task(self.run_cycle(name))
+            self.running[name] = task
+            task.add_done_callback(lambda _, name=name: self.running.pop(name, None))
+
+    async def run(self, once=None, repeat=1):
+        self.stopping = asyncio.Event()
+        await self.warm()
+        try:
+            if once:
+                for _ in range(repeat):   # repeat > 1: several cycles on the same warm clients, as the schedule would
+                    await self.run_cycle(once)
+                return
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self.stopping.set)
+            log(f"🛰️ Daemon up. Cycles: {', '.join(self.cycles)}")
+            await asyncio.gather(*(self.schedule(name) for name in self.cycles))
+            if self.running:
+                log(f"🛑 Stopping. Waiting up to {DAEMON_SHUTDOWN_GRACE:.0f}s for: {', '.join(self.running)}")
+                await asyncio.wait(list(self.running.values()), timeout=DAEMON_SHUTDOWN_GRACE)
+        finally:
+            if self.telegram is not None:
+                await self.telegram.disconnect()
+            log("👋 Daemon stopped.")
+
+if __name__ == "__main__":
+    # python daemon.py                 run every cycle in DAEMON_CYCLES on its schedule
+    # python daemon.py --once jobs     warm up, run one cycle now, exit
+    # python daemon.py --once jobs --repeat 2   the same cycle twice in one process
+    # python daemon.py --next          print the next trigger times and exit
+    args = sys.argv[1:]
+    if "--next" in args:
+        for name in DAEMON_CYCLES:
+            print(f"{name:<8} {SCHEDULE[name]:<16} next {Trigger(SCHEDULE[name]).next_fire():%Y-%m-%d %H:%M} UTC")
+        sys.exit(0)
+    once = args[args.index("--once") + 1] if "--once" in args else None
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else 1
+    try:
+        asyncio.run(Daemon([once] if once else DAEMON_CYCLES).run(once, repeat))
+    except RuntimeError as e:
+        sys.exit(f"❌ {e}")
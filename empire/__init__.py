@@ -0,0 +1 @@
+"""Shared plumbing for the Empire engines (main.py, main_empire.py, telegram_bot/)."""
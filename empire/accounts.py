@@ -0,0 +1,118 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future
+from empire.net import TokenBucket
+
+# --- 1. CONFIGURATION ---
+# accounts.json lists the LinkedIn profiles to fan out to. Tokens stay in the environment:
+#   [{"name": "acme", "token_env": "LINKEDIN_TOKEN_ACME", "engines": ["news", "jobs"], "rps": 0.5,
+#     "voice": "a hiring manager at a fintech startup"}]
+ACCOUNTS_FILE = os.environ.get("ACCOUNTS_FILE", "accounts.json")
+ENGINES = ("news", "visual", "jobs")
+ACCOUNT_RPS = float(os.environ.get("ACCOUNT_LINKEDIN_RPS", "1"))     # LinkedIn calls/s per account
+ACCOUNT_BURST = float(os.environ.get("ACCOUNT_LINKEDIN_BURST", "5"))
+NAME = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+
+def accounts_configured(path=None):
+    return os.path.exists(path or ACCOUNTS_FILE)
+
+# --- 2. THE TENANT ---
+class Account:
+    """
+    One LinkedIn profile: its token, its own rate limit, its own voice for generated copy, and its own
+    namespace for state files (history, publish ledger, identity cache, publish queue). The default
+    account, used when there is no accounts.json, keeps today's file names and prompts.
+    """
+
+    def __init__(self, name, token, engines=ENGINES, rps=ACCOUNT_RPS, burst=ACCOUNT_BURST, default=False, voice=None):
+        self.name = name
+        self.token = token
+        self.engines = tuple(engines)
+        self.voice = voice
+        self.namespace = None if default else name
+        self.limiter = TokenBucket(rps, capacity=burst)
+        self._publisher = None
+        self._lock = threading.Lock()
+
+    def path(self, filename):
+        """posted_history.db → posted_history.<name>.db (unchanged for the default account)."""
+        if self.namespace is None:
+            return filename
+        root, ext = os.path.splitext(filename)
+        return f"{root}.{self.namespace}{ext}"
+
+    @property
+    def prompt_note(self):
+        """Added to every generation prompt, so each profile gets its own copy (and its own LLM cache entries)."""
+        if self.namespace is None:
+            return ""
+        note = f"\n    PROFILE: This post is for the '{self.name}' LinkedIn profile"
+        note += f", written as {self.voice}." if self.voice else "."
+        return note + " Other profiles post about the same material: word it your own way.\n"
+
+    @property
+    def publisher(self):
+        with self._lock:
+            if self._publisher is None:
+                from empire.linkedin import LinkedInPublisher, URN_CACHE_FILE, PUBLISH_LEDGER_DB
+                self._publisher = LinkedInPublisher(self.token, urn_cache=self.path(URN_CACHE_FILE),
+                                                    ledger_path=self.path(PUBLISH_LEDGER_DB), limiter=self.limiter)
+            return self._publisher
+
+    def __repr__(self):
+        return f"Account({self.name!r}, engines={list(self.engines)})"
+
+def load_accounts(engine=None, path=None):
+    """
+    The accounts that run `engine` (all of them if None). Entries whose token variable is unset are
+    skipped with a warning. Without an accounts file: one default account on LINKEDIN_ACCESS_TOKEN.
+    """
+    path = path or ACCOUNTS_FILE
+    if not os.path.exists(path):
+        return [Account("default", os.environ.get("LINKEDIN_ACCESS_TOKEN"), default=True)]
+    with open(path) as f:
+        entries = json.load(f)
+
+    accounts, seen = [], set()
+    for entry in entries:
+        name = str(entry.get("name", "")).lower()
+        if not NAME.match(name) or name in seen:
+            raise ValueError(f"{path}: account name '{name}' must be unique, lowercase letters/digits/_/-")
+        seen.add(name)
+        engines = entry.get("engines", ENGINES)
+        if engine is not None and engine not in engines:
+            continue
+        token_env = entry.get("token_env") or f"LINKEDIN_TOKEN_{name.upper().replace('-', '_')}"
+        token = os.environ.get(token_env)
+        if not token:
+            print(f"⚠️ Account '{name}': ${token_env} is not set. Skipping.")
+            continue
+        accounts.append(Account(name, token, engines, float(entry.get("rps", ACCOUNT_RPS)),
+                                float(entry.get("burst", ACCOUNT_BURST)), voice=entry.get("voice")))
+    return accounts
+
+# --- 3. SHARED RESULTS (Computed Once per Fan-Out) ---
+class Shared:
+    """
+    Per-run memo that also collapses concurrent callers: the first account to ask for a key computes it,
+    the others wait for that result (or its exception) instead of repeating the work.
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, fn):
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+        if owner:
+            try:
+                future.set_result(fn())
+            except BaseException as e:   # includes the engines' sys.exit()
+                future.set_exception(e)
+        return future.result()
@@ -0,0 +1,138 @@
+import hashlib
+import io
+import math
+import os
+import random
+import threading
+import time
+
+# --- 1. CONFIGURATION ---
+ART_MODEL = "black-forest-labs/FLUX.1-schnell"
+ART_INFERENCE_URL = os.environ.get("ART_INFERENCE_URL")   # full endpoint URL, overrides the hosted model
+ART_POOL_DIR = os.environ.get("ART_POOL_DIR", "art_pool")
+ART_POOL_SIZE = int(os.environ.get("ART_POOL_SIZE", "3"))   # ready images kept per prompt
+
+def prompt_key(prompt, model=ART_MODEL):
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()[:24]
+
+# --- 2. THE GALLERY (Prompt-Keyed Pool) ---
+class ArtPool:
+    """
+    Ready-to-post images on disk, one folder per hash(prompt, model).
+    take() pops the oldest image so a post never waits on inference; fill() tops each
+    prompt back up to `size` images and is meant to run off the critical path.
+    """
+
+    def __init__(self, root=ART_POOL_DIR, size=ART_POOL_SIZE, model=ART_MODEL, token=None):
+        self.root = root
+        self.size = size
+        self.model = model
+        self.token = token or os.environ.get("HUGGINGFACE_TOKEN")
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from huggingface_hub import InferenceClient
+                self._client = InferenceClient(token=self.token)
+            return self._client
+
+    def _dir(self, prompt):
+        return os.path.join(self.root, prompt_key(prompt, self.model))
+
+    def ready(self, prompt):
+        folder = self._dir(prompt)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".png"))
+
+    def take(self, prompt):
+        """Pops one pooled image as PNG bytes, or None if the pool for this prompt is empty."""
+        with self._lock:
+            for path in self.ready(prompt):
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    os.remove(path)
+                    return data
+                except OSError:
+                    continue
+        return None
+
+    def generate(self, prompt):
+        """Synchronous FLUX inference. Returns PNG bytes."""
+        image = self.client.text_to_image(prompt=prompt, model=ART_INFERENCE_URL or self.model)
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        return buf.getvalue()
+
+    def add(self, prompt, data):
+        folder = self._dir(prompt)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{time.time_ns()}.png")
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)   # readers never see a half-written file
+        return path
+
+    def fill(self, prompts, size=None):
+        """Tops every prompt up to `size` ready images. Returns the number generated."""
+        size = size or self.size
+        made = 0
+        for prompt in prompts:
+            while len(self.ready(prompt)) < size:
+                try:
+                    self.add(prompt, self.generate(prompt))
+                    made += 1
+                except Exception as e:
+                    print(f"⚠️ Art pool refill failed for '{prompt[:40]}...': {e}")
+                    break
+        return made
+
+    def fill_in_background(self, prompts, size=None):
+        thread = threading.Thread(target=self.fill, args=(prompts, size), name="art-pool-fill", daemon=True)
+        thread.start()
+        return thread
+
+# --- 3. THE DRAFTSMAN (Procedural Fallback) ---
+def render_blueprint(prompt, size=(1200, 1200)):
+    """
+    Instant local stand-in: an isometric wireframe schematic in cyan on dark blue,
+    seeded by the prompt so the same topic always gets the same layout. Returns PNG bytes.
+    """
+    from PIL import Image, ImageDraw   # deferred: pool hits never draw
+    rng = random.Random(prompt_key(prompt, "procedural"))
+    w, h = size
+    image = Image.new("RGB", size, (8, 22, 52))
+    draw = ImageDraw.Draw(image)
+
+    for x in range(0, w, 40):
+        draw.line([(x, 0), (x, h)], fill=(18, 44, 88) if x % 200 else (28, 68, 120), width=1)
+    for y in range(0, h, 40):
+        draw.line([(0, y), (w, y)], fill=(18, 44, 88) if y % 200 else (28, 68, 120), width=1)
+
+    cos30, sin30 = math.cos(math.pi / 6), math.sin(math.pi / 6)
+    def iso(x, y, z, ox, oy, s):
+        return (ox + (x - y) * cos30 * s, oy + (x + y) * sin30 * s - z * s)
+
+    cyan = (0, 229, 255)
+    nodes = []
+    for _ in range(rng.randint(5, 9)):
+        ox, oy = rng.randint(200, w - 200), rng.randint(260, h - 160)
+        s = rng.randint(40, 90)
+        dz = rng.choice([1, 1.5, 2, 3])
+        corners = [iso(x, y, z, ox, oy, s) for z in (0, dz) for x, y in ((0, 0), (1, 0), (1, 1), (0, 1))]
+        for a, b in ((0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)):
+            draw.line([corners[a], corners[b]], fill=cyan, width=2)
+        nodes.append(corners[4])
+
+    for a, b in zip(nodes, nodes[1:]):
+        mid = (b[0], a[1])
+        draw.line([a, mid, b], fill=(0, 150, 190), width=1)
+        draw.ellipse([b[0] - 4, b[1] - 4, b[0] + 4, b[1] + 4], outline=cyan, width=2)
+
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", optimize=False)
+    return buf.getvalue()
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+from empire import telemetry
+from empire.mock_api import MockAPI, parse_spec
+from empire.startup import DUMMY_ENV
+
+# --- 1. SCENARIOS ---
+# Each scenario is a list of entry-point runs (script + args) that make up one end-to-end cycle.
+# Every run of a scenario starts in a fresh working directory, so state files never carry over.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = {
+    "news": [("main.py",)],
+    "visual": [("main_empire.py",)],
+    "art": [("main_empire.py", "--fill-art-pool")],
+    "jobs": [("telegram_bot/listener.py",), ("telegram_bot/poster.py", "--batch", "{batch}", "--drain")],
+    "daemon": [("daemon.py", "--once", "jobs", "--repeat", "2")],   # two cycles on one set of warm clients
+}
+# Poster batches each run must publish in full when no errors are injected; a shortfall counts as a failed run.
+EXPECTED_BATCHES = {"jobs": 1, "daemon": 2}
+BENCH_RUNS = int(os.environ.get("BENCH_RUNS", "5"))
+BENCH_BATCH = int(os.environ.get("BENCH_BATCH", "10"))   # posts per poster batch in the jobs scenario
+BENCH_SEED = int(os.environ.get("BENCH_SEED", "7"))      # same topic/mode picks on every commit
+BENCH_RESULTS_DIR = os.environ.get("BENCH_RESULTS_DIR", os.path.join(ROOT, "bench_results"))
+
+# Offline settings: no caches from earlier runs, local market data, every queued post due at once.
+BENCH_ENV = {
+    "LLM_MODE": "off",
+    "MARKET_DATA_SOURCE": "local",
+    "POST_INTERVAL_MINUTES": "0",
+    "DRAIN_LIMIT": "{batch}",
+    "POST_BATCH_SIZE": "{batch}",
+    "ART_POOL_SIZE": "1",
+    "PYTHONUNBUFFERED": "1",
+}
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0-100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+def git_revision():
+    """(short commit, dirty?) of the tree being measured, or ("unknown", False) outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip() != ""
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+# --- 2. THE CHILD (One Entry Point, Measured) ---
+def _run_entry(script):
+    if script in ("telegram_bot/listener.py", "daemon.py"):
+        # Telegram speaks MTProto, so the listener gets the in-process stand-in client instead of a URL
+        from empire.mock_api import MockTelegramClient
+        sys.path.insert(0, os.path.join(ROOT, "telegram_bot"))
+        import listener
+        listener.make_client = MockTelegramClient.from_env
+    if script == "telegram_bot/listener.py":
+        asyncio.run(listener.main())
+    else:
+        runpy.run_path(os.path.join(ROOT, script), run_name="__main__")
+
+def _child(out_path, script, args):
+    """Runs one entry point in this process and writes its wall time, exit status and peak RSS to out_path."""
+    random.seed(int(os.environ.get("BENCH_SEED", BENCH_SEED)))
+    sys.argv = [script] + list(args)
+    sys.path.insert(0, ROOT)
+    started = time.perf_counter()
+    status = 0
+    try:
+        _run_entry(script)
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        print(f"❌ {type(e).__name__}: {e}")
+        status = 1
+    finally:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KiB on Linux
+        with open(out_path, "w") as f:
+            json.dump({"wall_s": time.perf_counter() - started, "exit": status, "peak_rss_mb": round(peak_mb, 1)}, f)
+    sys.exit(status)
+
+# --- 3. THE HARNESS ---
+def run_scenario(name, mock, runs=BENCH_RUNS, batch=BENCH_BATCH, seed=BENCH_SEED):
+    """
+    Runs scenario `name` `runs` times against `mock`. Returns its summary:
+    per-stage p50/p95 (pipeline stages plus each entry point's own wall time), posts/min, peak RSS.
+    """
+    samples, steps, peaks, failures, posts, busy_s, traces = {}, {}, [], 0, 0, 0.0, []
+    for run in range(runs):
+        with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as cwd:
+            timings_file = os.path.join(cwd, "pipeline_timings.jsonl")
+            trace_file = os.path.join(cwd, "telemetry.jsonl")
+            env = dict(os.environ)
+            for key, value in DUMMY_ENV.items():
+                env.setdefault(key, value)
+            env.update({k: v.format(batch=batch) for k, v in BENCH_ENV.items()})
+            env.update(mock.env())
+            env.update({"PIPELINE_TIMINGS_FILE": timings_file, "TELEMETRY_FILE": trace_file, "BENCH_SEED": str(seed + run),
+                        "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))})
+
+            before = mock.snapshot().get("linkedin", {}).get("posts", 0)
+            total = 0.0
+            for step in SCENARIOS[name]:
+                script, args = step[0], [a.format(batch=batch) for a in step[1:]]
+                out_path = os.path.join(cwd, "child.json")
+                with open(os.path.join(cwd, "output.log"), "a") as log:
+                    subprocess.run([sys.executable, "-m", "empire.benchmark", "--child", out_path, script, *args],
+                                   cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+                try:
+                    with open(out_path) as f:
+                        result = json.load(f)
+                except (OSError, ValueError):
+                    result = {"wall_s": 0.0, "exit": 1, "peak_rss_mb": 0.0}
+                stage = os.path.splitext(os.path.basename(script))[0]
+                steps.setdefault(stage, []).append(result["wall_s"])
+                peaks.append(result["peak_rss_mb"])
+                total += result["wall_s"]
+                if result["exit"] != 0:
+                    failures += 1
+                    with open(os.path.join(cwd, "output.log")) as log:
+                        lines = [line.strip() for line in log if line.strip()]
+                    reason = ([l for l in lines if l.startswith("❌")] or lines or ["no output"])[-1]
+                    print(f"   ⚠️ {name} run {run + 1}: {script} exited {result['exit']} ({reason})")
+                    break
+            steps.setdefault("total", []).append(total)
+            busy_s += total
+            published = mock.snapshot().get("linkedin", {}).get("posts", 0) - before
+            posts += published
+            expected = EXPECTED_BATCHES.get(name, 0) * batch
+            if published < expected and not mock.faults.errors and result["exit"] == 0:
+                failures += 1
+                print(f"   ⚠️ {name} run {run + 1}: published {published} of {expected} posts")
+
+            if os.path.exists(timings_file):
+                with open(timings_file) as f:
+                    for line in f:
+                        for row in json.loads(line)["stages"]:
+                            samples.setdefault(row["stage"], []).append(row["wall_s"])
+            if os.path.exists(trace_file):
+                traces.extend(telemetry.load([trace_file]))
+
+    return {
+        "runs": runs,
+        "failures": failures,
+        "stages": {stage: {"p50_ms": round(percentile(v, 50) * 1000, 1), "p95_ms": round(percentile(v, 95) * 1000, 1), "n": len(v)}
+                   for stage, v in {**samples, **steps}.items()},
+        "posts": posts,
+        "posts_per_min": round(posts / (busy_s / 60), 2) if busy_s else 0.0,
+        "peak_rss_mb": max(peaks, default=0.0),
+        "counters": telemetry.summarize(traces)["counters"],   # API calls, bytes, tokens and retries, all runs
+    }
+
+def print_summary(name, summary, baseline=None):
+    print(f"\n📊 {name}: {summary['runs']} runs, {summary['failures']} failed, "
+          f"{summary['posts']} posts ({summary['posts_per_min']} posts/min), peak RSS {summary['peak_rss_mb']:.0f} MB")
+    old = (baseline or {}).get("stages", {})
+    for stage, row in summary["stages"].items():
+        delta = ""
+        if stage in old and old[stage]["p50_ms"]:
+            delta = f"  ({(row['p50_ms'] / old[stage]['p50_ms'] - 1) * 100:+.0f}% p50 vs baseline)"
+        print(f"   {stage:<12} p50 {row['p50_ms']:>9.1f} ms   p95 {row['p95_ms']:>9.1f} ms{delta}")
+
+# --- 4. THE LEDGER (Results Per Commit) ---
+def save_results(record, results_dir=BENCH_RESULTS_DIR):
+    """Writes <commit>.json (latest run for that commit) and appends to history.jsonl."""
+    os.makedirs(results_dir, exist_ok=True)
+    name = record["commit"] + ("-dirty" if record["dirty"] else "")
+    with open(os.path.join(results_dir, f"{name}.json"), "w") as f:
+        json.dump(record, f, indent=2)
+    with open(os.path.join(results_dir, "history.jsonl"), "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return os.path.join(results_dir, f"{name}.json")
+
+def load_results(revision, results_dir=BENCH_RESULTS_DIR):
+    """The stored record for a git revision (any form git understands), or None."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short=12", revision], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = revision
+    for name in (commit, commit + "-dirty"):
+        try:
+            with open(os.path.join(results_dir, f"{name}.json")) as f:
+                return json.load(f)
+        except OSError:
+            continue
+    return None
+
+def main(argv):
+    if argv[:1] == ["--child"]:
+        _child(argv[1], argv[2], argv[3:])
+    options, names = {}, []
+    args = iter(argv)
+    for arg in args:
+        if arg.startswith("--"):
+            options[arg] = next(args, "")
+        else:
+            names.append(arg)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        sys.exit(f"❌ Unknown scenario(s) {unknown}. Choose from {sorted(SCENARIOS)}.")
+
+    runs = int(options.get("--runs", BENCH_RUNS))
+    batch = int(options.get("--batch", BENCH_BATCH))
+    latency, errors = parse_spec(options.get("--latency")), parse_spec(options.get("--errors"))
+    baseline = load_results(options["--compare"]) if "--compare" in options else None
+    if "--compare" in options and baseline is None:
+        print(f"⚠️ No stored results for {options['--compare']}. Reporting without a baseline.")
+
+    commit, dirty = git_revision()
+    record = {"commit": commit, "dirty": dirty, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "python": sys.version.split()[0], "runs": runs, "batch": batch, "scenarios": {}}
+    with MockAPI(latency, errors, seed=BENCH_SEED) as mock:
+        record["latency_ms"], record["error_rates"] = mock.faults.latency, mock.faults.errors
+        print(f"🧪 Benchmarking {commit}{' (dirty)' if dirty else ''} against stand-in APIs at {mock.url}")
+        for name in names or list(SCENARIOS):
+            summary = run_scenario(name, mock, runs, batch)
+            record["scenarios"][name] = summary
+            print_summary(name, summary, (baseline or {}).get("scenarios", {}).get(name))
+        record["api_calls"] = mock.snapshot()
+    print(f"\n💾 Results saved to {save_results(record)}")
+    failed = [name for name, summary in record["scenarios"].items() if summary["failures"]]
+    if "--strict" in options and failed:
+        sys.exit(f"❌ Failed runs in: {', '.join(failed)}")
+
+if __name__ == "__main__":
+    # python -m empire.benchmark [news|visual|art|jobs|daemon ...] [--runs 5] [--batch 10]
+    #                            [--latency cse=200,gemini=800] [--errors linkedin=0.05] [--compare <git rev>]
+    #                            [--strict 1]   exit non-zero if any run failed or fell short of its posts
+    main(sys.argv[1:])
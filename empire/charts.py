@@ -0,0 +1,125 @@
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.dates as mdates
+from matplotlib import style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# --- 1. RESOLUTION PROFILES ---
+RESOLUTION_PROFILES = {
+    "preview": {"figsize": (10, 6), "dpi": 72},
+    "linkedin": {"figsize": (10, 6), "dpi": 120},   # 1200px wide: LinkedIn's display width
+    "print": {"figsize": (10, 6), "dpi": 300},      # The old pyplot output
+}
+CHART_PROFILE = os.environ.get("CHART_PROFILE", "linkedin")
+SMA_WINDOW = 5
+
+PRICE_COLOR = "#00ff41"
+TREND_COLOR = "#ff00ff"
+GRID_COLOR = "#333333"
+
+def sma(values, window=SMA_WINDOW):
+    """Trailing simple moving average; the first window-1 points are NaN (same as pandas rolling)."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+# --- 2. THE TEMPLATE (Object-Oriented Agg) ---
+class ChartTemplate:
+    """
+    A styled figure built once and reused: render() only swaps the line data and title,
+    so each extra chart costs a draw + PNG encode, not a new figure.
+    No pyplot state machine is involved.
+    """
+
+    def __init__(self, profile=CHART_PROFILE):
+        self.profile = RESOLUTION_PROFILES[profile]
+        with style.context("dark_background"):
+            self.fig = Figure(figsize=self.profile["figsize"], facecolor="black")
+            FigureCanvasAgg(self.fig)
+            ax = self.ax = self.fig.add_subplot()
+            self.price_line, = ax.plot([], [], label="Price", color=PRICE_COLOR, linewidth=2)
+            self.trend_line, = ax.plot([], [], label="Trend", color=TREND_COLOR, linestyle="--", linewidth=1.5)
+            self.title = ax.set_title("", color="white", fontsize=14, fontweight="bold", pad=20)
+            ax.grid(True, color=GRID_COLOR, linestyle="--", alpha=0.5)
+            ax.legend(loc="upper left", frameon=False)
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+            ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d"))
+            ax.tick_params(axis="x", labelrotation=45)
+
+    def render(self, ticker, dates, closes):
+        """Returns PNG bytes for one ticker. `dates` is datetime64-like, `closes` float-like."""
+        dates = np.asarray(dates, dtype="datetime64[ns]")
+        closes = np.asarray(closes, dtype=np.float64)
+        self.price_line.set_data(dates, closes)
+        self.trend_line.set_data(dates, sma(closes))
+        self.title.set_text(f"${ticker} | MARKET VELOCITY")
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+        buf = io.BytesIO()
+        with style.context("dark_background"):
+            self.fig.savefig(buf, format="png", dpi=self.profile["dpi"], bbox_inches="tight", facecolor="black")
+        return buf.getvalue()
+
+_TEMPLATES = {}
+
+def get_template(profile=CHART_PROFILE):
+    """One template per (process, profile)."""
+    if profile not in _TEMPLATES:
+        _TEMPLATES[profile] = ChartTemplate(profile)
+    return _TEMPLATES[profile]
+
+def render_chart(ticker, dates, closes, profile=CHART_PROFILE):
+    return get_template(profile).render(ticker, dates, closes)
+
+# --- 3. BATCH RENDERING (Process Pool) ---
+def _render_batch(profile, batch):
+    template = get_template(profile)
+    return [(ticker, template.render(ticker, dates, closes)) for ticker, dates, closes in batch]
+
+def render_universe(series, profile=CHART_PROFILE, workers=None):
+    """
+    Renders every ticker in `series` ({ticker: (dates, closes)}) in one call.
+    Tickers are split into one batch per worker so each process builds its template once.
+    Returns {ticker: png_bytes}.
+    """
+    items = [(t, d, c) for t, (d, c) in series.items()]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(items)))
+    if workers == 1:
+        return dict(_render_batch(profile, items))
+
+    batches = [items[i::workers] for i in range(workers)]
+    charts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rendered in pool.map(_render_batch, [profile] * workers, batches):
+            charts.update(rendered)
+    return charts
+
+def _bench(n, profile):
+    rng = np.random.default_rng(7)
+    dates = np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-01-23")).astype("datetime64[ns]")
+    series = {f"T{i}": (dates, 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))) for i in range(n)}
+    started = time.perf_counter()
+    render_chart("WARM", *series["T0"], profile=profile)
+    single = time.perf_counter() - started
+    started = time.perf_counter()
+    charts = render_universe(series, profile)
+    total = time.perf_counter() - started
+    cores = min(os.cpu_count() or 1, n)
+    print(f"📉 first chart (template build + render): {single * 1000:.0f} ms")
+    print(f"📉 {len(charts)} charts on {cores} cores in {total:.2f}s "
+          f"({total / len(charts) * cores * 1000:.0f} ms per chart per core, profile={profile})")
+
+if __name__ == "__main__":
+    # python -m empire.charts [n_tickers] [profile]
+    _bench(int(sys.argv[1]) if len(sys.argv) > 1 else 16, sys.argv[2] if len(sys.argv) > 2 else CHART_PROFILE)
@@ -0,0 +1,109 @@
+import hashlib
+import re
+from functools import lru_cache
+import numpy as np
+
+# --- 1. CONFIGURATION ---
+NUM_PERM = 64          # MinHash signature length
+BANDS = 32             # LSH bands (BANDS * ROWS must equal NUM_PERM)
+ROWS = NUM_PERM // BANDS
+SIMILARITY = 0.35      # Estimated Jaccard (over content words) needed to merge two candidates
+CHUNK_DOCS = 2000      # Bounds the (NUM_PERM x tokens) working matrix
+
+_PRIME = np.uint64(4294967311)   # First prime above 2**32
+_rng = np.random.default_rng(20250101)
+_A = _rng.integers(1, 2**31, NUM_PERM, dtype=np.uint64)[:, None]   # < 2**31 keeps A * x inside uint64
+_B = _rng.integers(0, 2**32, NUM_PERM, dtype=np.uint64)[:, None]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with", "new", "how",
+    "what", "why", "you", "your", "we", "our", "after", "over", "into", "about", "more", "than",
+}
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# --- 2. MINHASH SIGNATURES ---
+@lru_cache(maxsize=200_000)
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+def shingles(text):
+    """Content-word set of a title+snippet string."""
+    return {t for t in _TOKEN.findall((text or "").lower()) if t not in STOPWORDS and len(t) > 1}
+
+def minhash_signatures(texts):
+    """Returns an (n, NUM_PERM) uint64 MinHash matrix, computed a chunk of documents at a time."""
+    sigs = np.empty((len(texts), NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(texts), CHUNK_DOCS):
+        hashes, offsets = [], []
+        for i, text in enumerate(texts[start:start + CHUNK_DOCS]):
+            offsets.append(len(hashes))
+            tokens = shingles(text) or {f"__empty_{start + i}"}   # Empty docs only match themselves
+            hashes.extend(_token_hash(t) for t in tokens)
+        h = np.asarray(hashes, dtype=np.uint64)[None, :]
+        permuted = (_A * h + _B) % _PRIME
+        sigs[start:start + len(offsets)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return sigs
+
+# --- 3. LSH CANDIDATE PAIRS ---
+def similar_pairs(sigs, threshold=SIMILARITY):
+    """Banded LSH over the signatures; returns verified (i, j) index pairs with estimated Jaccard >= threshold."""
+    n = len(sigs)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    bands = sigs.reshape(n, BANDS, ROWS)
+    pairs = []
+    for b in range(BANDS):
+        keys = bands[:, b, 0].copy()
+        for r in range(1, ROWS):
+            keys = (keys << np.uint64(32)) ^ bands[:, b, r]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        if same.any():
+            # Neighbours inside a bucket; chained pairs are enough for union-find.
+            pairs.append(np.stack([order[:-1][same], order[1:][same]], axis=1))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.unique(np.sort(np.concatenate(pairs), axis=1), axis=0)
+    estimated = (sigs[pairs[:, 0]] == sigs[pairs[:, 1]]).mean(axis=1)
+    return pairs[estimated >= threshold]
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+# --- 4. STORY CLUSTERS ---
+def cluster_candidates(candidates, threshold=SIMILARITY):
+    """
+    Collapses near-duplicate candidates (same story from several outlets) into one representative each.
+    The representative is the member with the most text; it gains `cluster_size` and `cluster_links`.
+    """
+    if len(candidates) < 2:
+        return list(candidates)
+
+    texts = [f"{c.get('title') or ''} {c.get('snippet') or ''}" for c in candidates]
+    sigs = minhash_signatures(texts)
+
+    parent = list(range(len(candidates)))
+    for i, j in similar_pairs(sigs, threshold):
+        ri, rj = _find(parent, int(i)), _find(parent, int(j))
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    groups = {}
+    for i in range(len(candidates)):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    stories = []
+    for members in groups.values():
+        best = max(members, key=lambda i: len(texts[i]))
+        rep = dict(candidates[best])
+        rep["cluster_size"] = len(members)
+        rep["cluster_links"] = [candidates[i]["link"] for i in members if i != best]
+        stories.append(rep)
+    return stories
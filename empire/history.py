@@ -0,0 +1,220 @@
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# --- 1. URL CANONICALIZATION ---
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "referrer", "spm", "si", "cmpid", "ncid", "smid", "_ga",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "oly_")
+BLOOM_SAVE_EVERY = 100        # adds between writes of the filter (it is also written on close)
+COMPACT_FREE_RATIO = 0.25     # VACUUM only once this share of the file's pages is free
+
+def _is_tracking(param):
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+def strip_tracking(url):
+    """The link as given minus tracking params: the form shown to people (canonicalize_url() is only for keys)."""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def canonicalize_url(url):
+    """
+    Reduces a link to the form we store and compare:
+    no scheme (http == https), lowercase host without 'www.', no fragment,
+    no tracking params, remaining params sorted, no trailing slash.
+    """
+    url = (url or "").strip()
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)]
+    query.sort()
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", host, path, urlencode(query), "")).lstrip("/")
+
+def url_key(url):
+    """Fixed-width 16-byte key of the canonical URL (the primary key of the history table)."""
+    return hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=16).digest()
+
+# --- 2. BLOOM FILTER (Optional Front) ---
+class BloomFilter:
+    """
+    Plain bit-array Bloom filter with double hashing.
+    A negative answer is definitive, so most "never seen" lookups skip SQLite entirely.
+    """
+
+    def __init__(self, capacity=200_000, error_rate=0.001):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    HEADER = struct.Struct("<QQI")   # capacity, size, hashes
+
+    def to_bytes(self):
+        """Header plus the raw bit array; no pickle, so a cache-restored file cannot run code."""
+        return self.HEADER.pack(self.capacity, self.size, self.hashes) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        capacity, size, hashes = cls.HEADER.unpack_from(blob)
+        bits = bytearray(blob[cls.HEADER.size:])
+        if len(bits) != (size + 7) // 8:
+            raise ValueError("Bloom filter blob is truncated")
+        bloom = cls.__new__(cls)
+        bloom.capacity, bloom.size, bloom.hashes, bloom.bits = capacity, size, hashes, bits
+        return bloom
+
+# --- 3. THE ARCHIVE (SQLite Store) ---
+class HistoryStore:
+    """
+    Posted-link memory backed by one SQLite table keyed on the canonical-URL hash.
+    Lookups are a primary-key probe (flat cost as history grows), adds are single-row
+    inserts, and expire()/compact() keep the file bounded. The Bloom filter is written
+    every BLOOM_SAVE_EVERY adds and on close(), together with the row count it covers.
+    """
+
+    def __init__(self, path="posted_history.db", ttl_days=None, use_bloom=True, legacy_file=None):
+        self.path = path
+        self.ttl_days = ttl_days
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " key BLOB PRIMARY KEY, url TEXT NOT NULL, posted_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS history_posted_at ON history(posted_at)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB)")
+        self.db.commit()
+
+        if legacy_file and os.path.exists(legacy_file) and len(self) == 0:
+            self.import_text(legacy_file)
+
+        self._unsaved = 0
+        self.bloom = self._load_bloom() if use_bloom else None
+
+    def _load_bloom(self):
+        """
+        Loads the persisted filter. It is rebuilt when missing, too full, or written for a different
+        row count (a run that ended before saving it), since a stale filter would miss recent links.
+        """
+        count = len(self)
+        rows = dict(self.db.execute("SELECT name, value FROM meta WHERE name IN ('bloom_bits', 'bloom_count')"))
+        if "bloom_bits" in rows and int(rows.get("bloom_count", -1)) == count:
+            try:
+                bloom = BloomFilter.from_bytes(rows["bloom_bits"])
+                if bloom.capacity >= count:
+                    return bloom
+            except (struct.error, ValueError):
+                pass
+        bloom = BloomFilter(capacity=max(count * 2, 10_000))
+        for (key,) in self.db.execute("SELECT key FROM history"):
+            bloom.add(key)
+        self.db.execute("DELETE FROM meta WHERE name = 'bloom'")   # pickled filter from older versions
+        self._save_bloom(bloom)
+        return bloom
+
+    def _save_bloom(self, bloom):
+        count = self.db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        self.db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                            [("bloom_bits", bloom.to_bytes()), ("bloom_count", count)])
+        self.db.commit()
+        self._unsaved = 0
+
+    def import_text(self, path):
+        """One-off migration from the old newline-delimited posted_history.txt."""
+        now = time.time()
+        with open(path, "r") as f:
+            rows = [(url_key(line), canonicalize_url(line), now) for line in (l.strip() for l in f) if line]
+        with self.lock:
+            self.db.executemany("INSERT OR IGNORE INTO history VALUES (?, ?, ?)", rows)
+            self.db.commit()
+        return len(rows)
+
+    def __contains__(self, url):
+        key = url_key(url)
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        with self.lock:
+            row = self.db.execute("SELECT posted_at FROM history WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        return self.ttl_days is None or row[0] >= time.time() - self.ttl_days * 86400
+
+    def add(self, url, posted_at=None):
+        key = url_key(url)
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO history VALUES (?, ?, ?)",
+                (key, canonicalize_url(url), posted_at or time.time()),
+            )
+            self.db.commit()
+            if self.bloom is not None:
+                self.bloom.add(key)
+                self._unsaved += 1
+                if self._unsaved >= BLOOM_SAVE_EVERY:
+                    self._save_bloom(self.bloom)
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def expire(self, ttl_days=None):
+        """Deletes entries older than the TTL. Returns the number removed."""
+        ttl_days = ttl_days if ttl_days is not None else self.ttl_days
+        if ttl_days is None:
+            return 0
+        with self.lock:
+            cur = self.db.execute("DELETE FROM history WHERE posted_at < ?", (time.time() - ttl_days * 86400,))
+            self.db.commit()
+            if cur.rowcount and self.bloom is not None:
+                self._save_bloom(self.bloom)   # keeps the saved row count in step with the table
+        # Expired keys may linger in the Bloom filter; that only costs an extra probe.
+        return cur.rowcount
+
+    def compact(self, free_ratio=COMPACT_FREE_RATIO):
+        """Expires old rows, then rewrites the file only once `free_ratio` of its pages are free."""
+        removed = self.expire()
+        with self.lock:
+            pages = self.db.execute("PRAGMA page_count").fetchone()[0]
+            free = self.db.execute("PRAGMA freelist_count").fetchone()[0]
+            if pages and free / pages >= free_ratio:
+                self.db.execute("VACUUM")
+        return removed
+
+    def close(self):
+        with self.lock:
+            if self.bloom is not None and self._unsaved:
+                self._save_bloom(self.bloom)
+            self.db.close()
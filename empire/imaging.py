@@ -0,0 +1,98 @@
+import hashlib
+import io
+import json
+import os
+import time
+
+# --- 1. CONFIGURATION ---
+# LinkedIn renders feed images at most 1200px wide; anything larger is wasted upload time.
+PROFILES = {
+    "linkedin": {"max_size": (1200, 1200), "format": "JPEG", "quality": 85},
+    "linkedin_hq": {"max_size": (2048, 2048), "format": "JPEG", "quality": 90},
+    "webp": {"max_size": (1200, 1200), "format": "WEBP", "quality": 80},
+}
+IMAGE_PROFILE = os.environ.get("IMAGE_PROFILE", "linkedin")   # "off" uploads assets untouched
+MEDIA_CACHE_DIR = os.environ.get("MEDIA_CACHE_DIR", ".media_cache")
+MEDIA_CACHE_MAX_MB = float(os.environ.get("MEDIA_CACHE_MAX_MB", "100"))
+BACKGROUND = (0, 0, 0)   # Transparent areas are flattened onto black, matching the dark chart theme
+
+EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp", "PNG": "png"}
+
+# --- 2. PROCESSED-ASSET CACHE ---
+def _cache_path(data, profile):
+    spec = json.dumps(PROFILES[profile], sort_keys=True).encode("utf-8")
+    key = hashlib.sha256(data + spec).hexdigest()[:32]
+    return os.path.join(MEDIA_CACHE_DIR, f"{key}.{EXTENSIONS[PROFILES[profile]['format']]}")
+
+def _prune_cache():
+    """Drops the least recently used outputs once the cache exceeds MEDIA_CACHE_MAX_MB."""
+    entries = []
+    for name in os.listdir(MEDIA_CACHE_DIR):
+        path = os.path.join(MEDIA_CACHE_DIR, name)
+        st = os.stat(path)
+        entries.append((st.st_atime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= MEDIA_CACHE_MAX_MB * 1024 * 1024:
+            break
+        os.remove(path)
+        total -= size
+
+# --- 3. THE DARKROOM (Resize + Re-encode) ---
+def _encode(data, spec):
+    from PIL import Image   # deferred: only needed on a cache miss
+    image = Image.open(io.BytesIO(data))
+    if image.format == "JPEG":
+        image.draft("RGB", spec["max_size"])   # DCT-domain downscale: decodes only what we need
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        flat = Image.new("RGB", image.size, BACKGROUND)
+        flat.paste(image, mask=image.getchannel("A"))
+        image = flat
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    image.thumbnail(spec["max_size"], Image.LANCZOS)
+
+    out = io.BytesIO()
+    if spec["format"] == "JPEG":
+        image.save(out, "JPEG", quality=spec["quality"], optimize=True, progressive=True)
+    else:
+        image.save(out, spec["format"], quality=spec["quality"], method=4)
+    return out.getvalue(), image.size
+
+def optimize_image(data, profile=None):
+    """
+    Downsizes and re-encodes an image for upload.
+    Returns (bytes, report) where report has bytes_in, bytes_out, ms, cached and size.
+    Outputs are cached by content hash + profile, so the same asset is only processed once.
+    """
+    profile = profile or IMAGE_PROFILE
+    started = time.perf_counter()
+    report = {"profile": profile, "bytes_in": len(data), "cached": False}
+    if profile == "off":
+        report.update(bytes_out=len(data), ms=0.0)
+        return data, report
+
+    path = _cache_path(data, profile)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            out = f.read()
+        os.utime(path)
+        report.update(bytes_out=len(out), cached=True, ms=(time.perf_counter() - started) * 1000)
+        return out, report
+
+    out, size = _encode(data, PROFILES[profile])
+    if len(out) >= len(data):
+        out = data   # Already small and well-encoded; re-encoding would only cost quality
+    os.makedirs(MEDIA_CACHE_DIR, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(out)
+    _prune_cache()
+    report.update(bytes_out=len(out), size=size, ms=(time.perf_counter() - started) * 1000)
+    return out, report
+
+def describe(report):
+    saved = 100 * (1 - report["bytes_out"] / max(report["bytes_in"], 1))
+    source = "cache" if report["cached"] else f"{report['ms']:.0f} ms"
+    return (f"🗜️ Image {report['bytes_in'] / 1024:.0f} KB → {report['bytes_out'] / 1024:.0f} KB "
+            f"({saved:.0f}% smaller, {report['profile']}, {source})")
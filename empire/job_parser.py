@@ -0,0 +1,137 @@
+import re
+import sys
+import time
+from functools import lru_cache
+from empire.history import strip_tracking
+
+# --- 1. THE AUTOMATA (Compiled Once) ---
+# "🔹 Role : SDE-1", "Company Name - Qualcomm", "CTC: 12 LPA" ... one pass over every labelled line.
+LABELS = {
+    "company": "company", "company name": "company", "organisation": "company", "organization": "company",
+    "role": "role", "job role": "role", "position": "role", "designation": "role", "profile": "role",
+    "job title": "role", "post": "role",
+    "batch": "batch", "eligible batch": "batch", "batches": "batch", "passout": "batch", "passout year": "batch",
+    "graduation year": "batch", "year of passing": "batch",
+    "location": "location", "job location": "location", "work location": "location", "locations": "location",
+    "salary": "salary", "ctc": "salary", "stipend": "salary", "package": "salary", "pay": "salary",
+    "apply link": "apply_url", "apply here": "apply_url", "link": "apply_url", "apply": "apply_url",
+}
+LABELLED_LINE = re.compile(r"^[^\w\n]*([A-Za-z][A-Za-z ]{0,20}?)\s*[:\-–=]+\s*(.+?)\s*$", re.M)   # label looked up in LABELS
+URL = re.compile(r"https?://(?:www\.)?([^/\s<>\"')\]?#:]+)[^\s<>\"')\]]*", re.I)
+YEAR = re.compile(r"\b20[1-3]\d\b")
+BATCH_WORDS = re.compile(r"batch|passout|pass\s*out|graduat", re.I)
+HIRING = re.compile(r"(?P<company>[A-Z][\w&.]*(?:\s+[A-Z][\w&.]*){0,3})\s+(?:is\s+)?(?:[Hh]iring|[Rr]ecruiting)\b")
+HIRING_FOR = re.compile(r"\b[Hh]iring\s+(?:for\s+)?(?:the\s+role\s+of\s+)?(?P<role>[A-Z][\w+#./ -]{2,60}?)\s*(?:[|,(!\n]|\s-\s|\s+(?:at|in|for)\b|$)", re.M)
+SALARY = re.compile(r"(?:₹|rs\.?\s*|inr\s*)[\d,.]+\s*(?:lpa|k|l|/\s*month|per\s+month)?|\b\d+(?:\.\d+)?\s*(?:-|to)?\s*(?:\d+(?:\.\d+)?\s*)?lpa\b", re.I)
+SALARY_MARKERS = ("lpa", "₹", "rs.", "rs ", "inr", "month")
+JOB_WORDS = re.compile(r"\b(?:hiring|job|jobs|intern|internship|opening|openings|vacancy|role|batch|fresher|freshers|recruitment|off\s*campus|apply)\b", re.I)
+NOISE_WORDS = re.compile(r"\b(?:join\s+(?:our|the)\s+(?:channel|group)|subscribe|giveaway|webinar|discount|coupon|promo\s*code|course\s+(?:link|launch)|paid\s+(?:course|mentorship))\b", re.I)
+
+# Links that point back at social/community pages, never at an application form
+NON_APPLY_HOSTS = ("t.me", "telegram.me", "telegram.org", "chat.whatsapp.com", "wa.me", "whatsapp.com",
+                   "instagram.com", "youtube.com", "youtu.be", "facebook.com", "twitter.com", "x.com")
+NON_APPLY_SUFFIXES = tuple("." + h for h in NON_APPLY_HOSTS)
+
+FIELDS = ("company", "role", "batch", "location", "salary", "apply_url")
+MAX_FIELD_CHARS = 80
+
+# --- 2. THE SIEVE (Extraction) ---
+def _clean(value):
+    value = value.strip(" \t*_`|•-–:")
+    return value[:MAX_FIELD_CHARS].rstrip() if value else None
+
+@lru_cache(maxsize=4096)
+def _display_link(url):
+    return strip_tracking(url)
+
+def _apply_url(text):
+    """
+    First link that is not a social/community page, as posted minus tracking params.
+    (Scheme, www. and the path stay as they are: some hosts only answer on one form; dedupe keys canonicalize.)
+    """
+    for match in URL.finditer(text):
+        host = match.group(1).lower()
+        if host in NON_APPLY_HOSTS or host.endswith(NON_APPLY_SUFFIXES):
+            continue
+        return _display_link(match.group(0).rstrip(".,!;:"))
+    return None
+
+def extract(text):
+    """
+    Structured record for one raw job post: company, role, batch, location, salary, apply_url
+    (missing fields are omitted). Returns None for non-job noise: posts without an
+    application link, without any job vocabulary, or that look like channel promotion.
+    """
+    if not text or "http" not in text:
+        return None
+    apply_url = _apply_url(text)
+    if apply_url is None:
+        return None
+
+    record = {}
+    for label, value in LABELLED_LINE.findall(text):
+        field = LABELS.get(label.lower())
+        if field and field not in record and field != "apply_url":
+            value = _clean(value)
+            if value:
+                record[field] = value
+
+    # Free-text fallbacks; the substring checks keep the costlier patterns off most posts
+    hiring = "iring" in text or "ecruiting" in text
+    if hiring and "company" not in record:
+        m = HIRING.search(text)
+        if m:
+            record["company"] = _clean(m.group("company"))
+    if hiring and "role" not in record:
+        m = HIRING_FOR.search(text)
+        if m:
+            record["role"] = _clean(m.group("role"))
+
+    # Years count as a batch only next to a batch word ("2023 batch", "Passout: 2024")
+    batch_source = record.get("batch") or " ".join(
+        text[max(m.start() - 12, 0):m.end() + 40] for m in BATCH_WORDS.finditer(text)
+    )
+    years = sorted(set(YEAR.findall(batch_source)))
+    if years:
+        record["batch"] = ", ".join(years)   # otherwise a labelled "Batch: Any" is kept as written
+    lower = text.lower()
+    if "salary" not in record and any(marker in lower for marker in SALARY_MARKERS):
+        m = SALARY.search(text)
+        if m:
+            record["salary"] = _clean(m.group(0))
+
+    has_fields = "company" in record or "role" in record
+    if not has_fields and (NOISE_WORDS.search(text) or not JOB_WORDS.search(text)):
+        return None
+
+    record["apply_url"] = apply_url
+    return {field: record[field] for field in FIELDS if record.get(field)}
+
+def extract_many(texts):
+    """Batch form of extract(): one record (or None) per input, in order."""
+    return [extract(text) for text in texts]
+
+def to_prompt(record):
+    """The compact form that goes to the LLM instead of the raw post."""
+    return "\n".join(f"{field.replace('_', ' ').title()}: {record[field]}" for field in FIELDS if field in record)
+
+def _bench(n):
+    samples = [
+        "🚨 Qualcomm is Hiring Freshers!\n🔹 Role : Associate Engineer\n🔹 Batch : 2024 / 2025\n🔹 Location: Hyderabad\n"
+        "🔹 CTC: 12 LPA\n🔗 Apply Link: https://careers.qualcomm.com/job/123?utm_source=telegram\nJoin: https://t.me/jobs",
+        "Infosys hiring for Systems Engineer | 2023 batch graduates | Salary 3.6 LPA\nApply here https://bit.ly/3xyz",
+        "Join our channel for daily updates! https://t.me/freshers_opening 🔥 Subscribe now",
+        "Company Name - Zoho\nDesignation - Member Technical Staff\nEligible Batch - 2022, 2023, 2024\nhttps://zoho.com/careers/mts",
+    ]
+    texts = [samples[i % len(samples)] + f" #{i}" for i in range(n)]
+    started = time.perf_counter()
+    records = extract_many(texts)
+    elapsed = time.perf_counter() - started
+    kept = sum(r is not None for r in records)
+    print(f"🧾 Extracted {n} posts in {elapsed * 1000:.0f} ms ({n / elapsed:,.0f} posts/s), {kept} kept as jobs")
+    for record in records[:len(samples)]:
+        print(f"   {record}")
+
+if __name__ == "__main__":
+    # python -m empire.job_parser [n_posts]
+    _bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+
+# --- 1. CONFIGURATION ---
+JOBS_DB = "jobs.db"
+JOBS_TTL_DAYS = 30   # Job alerts go stale fast; older rows (posted or not) are pruned
+
+def content_hash(text):
+    """Case- and whitespace-insensitive fingerprint, so the same alert reposted verbatim is stored once."""
+    normalized = re.sub(r"\s+", " ", (text or "").strip().lower())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+# --- 2. THE JOB BOARD (SQLite Store) ---
+class JobStore:
+    """
+    Append-only job inbox shared by listener.py (writes) and poster.py (reads).
+    Rows are unique on (channel, message_id) and on the content hash, so re-scans and
+    cross-posted alerts are ignored; with `dedupe`, reworded copies (near-identical SimHash)
+    and posts pointing at an already stored apply link are ignored too. A partial index covers only unposted rows, which keeps
+    next_unposted()/sample_unposted() a single index probe however large the table grows.
+    """
+
+    def __init__(self, path=JOBS_DB, ttl_days=JOBS_TTL_DAYS, dedupe=True):
+        self.path = path
+        self.ttl_days = ttl_days
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY,"
+            " channel TEXT NOT NULL, message_id INTEGER NOT NULL,"
+            " content_hash BLOB NOT NULL UNIQUE,"
+            " raw_text TEXT NOT NULL, found_at REAL NOT NULL, posted_at REAL,"
+            " fields TEXT,"
+            " UNIQUE (channel, message_id))"
+        )
+        columns = {row["name"] for row in self.db.execute("PRAGMA table_info(jobs)")}
+        if "fields" not in columns:   # stores created before structured extraction
+            self.db.execute("ALTER TABLE jobs ADD COLUMN fields TEXT")
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_unposted ON jobs(id) WHERE posted_at IS NULL")
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_found_at ON jobs(found_at)")
+        # Per-account posts for multi-account runs; posted_at stays the global "retired for everyone" flag
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS job_posts ("
+            " account TEXT NOT NULL, job_id INTEGER NOT NULL, posted_at REAL NOT NULL,"
+            " PRIMARY KEY (account, job_id)) WITHOUT ROWID"
+        )
+        self.db.execute(
+            "CREATE TRIGGER IF NOT EXISTS jobs_drop_posts AFTER DELETE ON jobs"
+            " BEGIN DELETE FROM job_posts WHERE job_id = OLD.id; END"
+        )
+        self.index = None
+        if dedupe:   # numpy comes in with the index; a dedupe=False store (the drain) needs only sqlite3
+            from empire.job_dedupe import SimHashIndex
+            self.index = SimHashIndex(self.db)
+        self.db.commit()
+        self.duplicates = 0
+
+    def add(self, channel, message_id, raw_text, fields=None, found_at=None):
+        """
+        Stores one job, with its extracted `fields` record if given.
+        Returns False if it was already known (same message, same or near-identical text, same apply link).
+        """
+        link = (fields or {}).get("apply_url")
+        fp = None
+        if self.index is not None:
+            from empire.job_dedupe import simhash
+            fp = simhash(raw_text, fields)
+        with self.lock:
+            if self.index is not None and ((link and self.index.find_link(link) is not None)
+                                           or self.index.find(fp) is not None):
+                self.duplicates += 1
+                return False
+            cur = self.db.execute(
+                "INSERT OR IGNORE INTO jobs (channel, message_id, content_hash, raw_text, found_at, fields)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (channel, int(message_id), content_hash(raw_text), raw_text, found_at or time.time(),
+                 json.dumps(fields, ensure_ascii=False) if fields else None),
+            )
+            if cur.rowcount == 1 and self.index is not None:
+                self.index.add(cur.lastrowid, fp, link)
+            self.db.commit()
+        return cur.rowcount == 1
+
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["fields"] = json.loads(job["fields"]) if job["fields"] else None
+        return job
+
+    def _unposted_from(self, min_id, account=None):
+        if account is None:
+            return self.db.execute(
+                "SELECT * FROM jobs WHERE posted_at IS NULL AND id >= ? ORDER BY id LIMIT 1", (min_id,)
+            ).fetchone()
+        return self.db.execute(
+            "SELECT * FROM jobs WHERE posted_at IS NULL AND id >= ? AND NOT EXISTS"
+            " (SELECT 1 FROM job_posts WHERE account = ? AND job_id = jobs.id) ORDER BY id LIMIT 1",
+            (min_id, account),
+        ).fetchone()
+
+    def next_unposted(self):
+        """The most recently found job that has not been posted yet, or None."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE posted_at IS NULL ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return self._job(row)
+
+    def sample_unposted(self, rng=random, account=None):
+        """
+        A random unposted job without loading the table: picks a random id between the
+        lowest and highest unposted ids and takes the first unposted row at or after it.
+        (Rows after a long gap of posted ids are slightly favoured; fine for picking a post.)
+        With `account`, jobs that account already posted are skipped too.
+        """
+        with self.lock:
+            # Two queries on purpose: SQLite only turns a lone MIN() or MAX() into an index seek
+            lo = self.db.execute("SELECT MIN(id) FROM jobs WHERE posted_at IS NULL").fetchone()[0]
+            hi = self.db.execute("SELECT MAX(id) FROM jobs WHERE posted_at IS NULL").fetchone()[0]
+            if lo is None:
+                return None
+            row = self._unposted_from(rng.randint(lo, hi), account)
+            if row is None and account is not None:
+                row = self._unposted_from(lo, account)   # everything after the pick was posted by this account
+        return self._job(row)
+
+    def mark_posted(self, job_id, posted_at=None, account=None):
+        """Marks a job posted: for every account (retired), or only for `account`."""
+        with self.lock:
+            if account is None:
+                self.db.execute("UPDATE jobs SET posted_at = ? WHERE id = ?", (posted_at or time.time(), job_id))
+            else:
+                self.db.execute("INSERT OR REPLACE INTO job_posts (account, job_id, posted_at) VALUES (?, ?, ?)",
+                                (account, job_id, posted_at or time.time()))
+            self.db.commit()
+
+    def unmark_posted(self, job_id, account=None):
+        """Undoes mark_posted(): the job goes back to the pool (for every account, or only for `account`)."""
+        with self.lock:
+            if account is None:
+                self.db.execute("UPDATE jobs SET posted_at = NULL WHERE id = ?", (job_id,))
+            else:
+                self.db.execute("DELETE FROM job_posts WHERE account = ? AND job_id = ?", (account, job_id))
+            self.db.commit()
+
+    def count_unposted(self, account=None):
+        with self.lock:
+            if account is None:
+                return self.db.execute("SELECT COUNT(*) FROM jobs WHERE posted_at IS NULL").fetchone()[0]
+            return self.db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE posted_at IS NULL AND NOT EXISTS"
+                " (SELECT 1 FROM job_posts WHERE account = ? AND job_id = jobs.id)", (account,)
+            ).fetchone()[0]
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def prune(self, ttl_days=None):
+        """Deletes jobs found more than ttl_days ago. Returns the number removed."""
+        ttl_days = ttl_days if ttl_days is not None else self.ttl_days
+        if ttl_days is None:
+            return 0
+        with self.lock:
+            cur = self.db.execute("DELETE FROM jobs WHERE found_at < ?", (time.time() - ttl_days * 86400,))
+            self.db.commit()
+        return cur.rowcount
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+import requests
+from empire import telemetry
+from empire.net import get_session
+from empire.media import ImageStream
+
+# --- 1. CONFIGURATION ---
+LINKEDIN_API_BASE = os.environ.get("LINKEDIN_API_BASE", "https://api.linkedin.com/v2").rstrip("/")
+URN_CACHE_FILE = os.environ.get("LINKEDIN_URN_CACHE", ".linkedin_identity.json")
+URN_TTL_HOURS = float(os.environ.get("LINKEDIN_URN_TTL_HOURS", "168"))
+PUBLISH_LEDGER_DB = os.environ.get("PUBLISH_LEDGER_DB", "publish_ledger.db")
+# A post whose outcome is unknown blocks its key until checked (`python -m empire.linkedin reset KEY`)
+# or until this many hours have passed, after which it may be sent again.
+UNKNOWN_TTL_HOURS = float(os.environ.get("PUBLISH_UNKNOWN_TTL_HOURS", "72"))
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = int(os.environ.get("LINKEDIN_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 60.0
+TIMEOUT = 30
+UPLOAD_TIMEOUT = 60
+
+class LinkedInError(RuntimeError):
+    """A LinkedIn call that failed for good. `status` is the HTTP status when there was a response."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+class AlreadyPublished(LinkedInError):
+    """publish() skipped a post whose key was already published. `post_urn` is the earlier post."""
+
+    def __init__(self, message, post_urn=None):
+        super().__init__(message)
+        self.post_urn = post_urn
+
+def retry_after(response, attempt):
+    """Seconds to wait before the next attempt: the server's Retry-After if given, else full-jitter backoff."""
+    header = response.headers.get("Retry-After") if response is not None else None
+    if header and header.strip().isdigit():
+        return min(float(header), BACKOFF_CAP)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+def idempotency_key(urn, text):
+    """Default key for a post: the same author posting the same text is the same post."""
+    return hashlib.sha256(f"{urn}\n{text}".encode("utf-8")).hexdigest()
+
+# --- 2. THE LEDGER (Idempotent Publishing) ---
+class PublishLedger:
+    """
+    One row per idempotency key: pending → published | failed | unknown.
+    'unknown' means the request may have reached LinkedIn (timeout, 5xx, dropped connection);
+    such a key is not sent again until it is reset by hand or UNKNOWN_TTL_HOURS have passed.
+    """
+
+    def __init__(self, path=PUBLISH_LEDGER_DB):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS ledger ("
+            " key TEXT PRIMARY KEY, state TEXT NOT NULL, post_urn TEXT, detail TEXT,"
+            " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute("SELECT state, post_urn FROM ledger WHERE key = ?", (key,)).fetchone()
+        return row
+
+    def blocked(self, key, ttl_hours=UNKNOWN_TTL_HOURS):
+        """True while an earlier pending/unknown attempt for `key` is recent enough to still block it."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT updated_at FROM ledger WHERE key = ? AND state IN ('pending', 'unknown')", (key,)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < ttl_hours * 3600
+
+    def unresolved(self):
+        """[(key, state, detail, updated_at)] for every pending/unknown key."""
+        with self.lock:
+            return self.db.execute(
+                "SELECT key, state, detail, updated_at FROM ledger WHERE state IN ('pending', 'unknown') ORDER BY updated_at"
+            ).fetchall()
+
+    def reset(self, prefix):
+        """Forgets unresolved keys starting with `prefix` (checked on LinkedIn by hand). Returns how many."""
+        with self.lock:
+            cur = self.db.execute(
+                "DELETE FROM ledger WHERE state IN ('pending', 'unknown') AND substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+            self.db.commit()
+        return cur.rowcount
+
+    def set(self, key, state, post_urn=None, detail=None):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO ledger VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET"
+                " state = excluded.state, post_urn = excluded.post_urn, detail = excluded.detail,"
+                " updated_at = excluded.updated_at",
+                (key, state, post_urn, detail, now, now),
+            )
+            self.db.commit()
+
+# --- 3. THE PUBLISHER ---
+class LinkedInPublisher:
+    """
+    Every LinkedIn call the engines make, on the pooled keep-alive session.
+    Reads and uploads are retried on 429/5xx (honouring Retry-After) and network errors;
+    the post itself is only retried when LinkedIn certainly did not create it (429, or the
+    connection never opened), and every post goes through the idempotency ledger.
+    """
+
+    def __init__(self, token=None, api_base=LINKEDIN_API_BASE, urn_cache=URN_CACHE_FILE, ledger_path=PUBLISH_LEDGER_DB,
+                 limiter=None):
+        self.token = token or os.environ.get("LINKEDIN_ACCESS_TOKEN")
+        self.api_base = api_base
+        self.urn_cache = urn_cache
+        self.ledger = PublishLedger(ledger_path)
+        self.limiter = limiter   # optional TokenBucket, one per account (empire/accounts.py)
+
+    def _headers(self, extra=None):
+        headers = {"Authorization": f"Bearer {self.token}", "X-Restli-Protocol-Version": "2.0.0"}
+        headers.update(extra or {})
+        return headers
+
+    def _request(self, method, url, retry=True, replayable=True, expect=(200, 201), timeout=TIMEOUT, **kwargs):
+        """
+        One API call with retries. `retry=False` keeps only the retries that are safe for a call that
+        must not run twice (429, connection never opened); `replayable=False` (a one-shot body) drops 429 too.
+        """
+        session = get_session()
+        for attempt in range(MAX_ATTEMPTS):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.ConnectTimeout as e:
+                # Never reached the server: safe to retry even a POST.
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise LinkedInError(f"{method} {url}: {e}")
+                telemetry.count("http.retries", api="linkedin")
+                time.sleep(retry_after(None, attempt))
+                continue
+            except requests.exceptions.RequestException as e:
+                if not (retry and replayable) or attempt == MAX_ATTEMPTS - 1:
+                    raise LinkedInError(f"{method} {url}: {e}")
+                telemetry.count("http.retries", api="linkedin")
+                time.sleep(retry_after(None, attempt))
+                continue
+
+            if response.status_code in expect:
+                return response
+            if response.status_code == 401:
+                self.forget_urn()
+            retryable = replayable and (response.status_code == 429 or (retry and response.status_code in RETRY_STATUS))
+            if not retryable or attempt == MAX_ATTEMPTS - 1:
+                raise LinkedInError(f"{method} {url}: {response.status_code} {response.text[:300]}", response.status_code)
+            delay = retry_after(response, attempt)
+            telemetry.count("http.retries", api="linkedin")
+            print(f"⏳ LinkedIn busy ({response.status_code}). Retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    # --- Identity (cached on disk) ---
+    def _token_id(self):
+        return hashlib.sha256((self.token or "").encode("utf-8")).hexdigest()[:16]
+
+    def _read_urn_cache(self):
+        try:
+            with open(self.urn_cache, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def forget_urn(self):
+        cache = self._read_urn_cache()
+        if cache.pop(self._token_id(), None) is not None:
+            with open(self.urn_cache, "w") as f:
+                json.dump(cache, f)
+
+    def get_urn(self):
+        """The member URN for this token, from the on-disk cache while it is younger than URN_TTL_HOURS."""
+        cache = self._read_urn_cache()
+        entry = cache.get(self._token_id())
+        if entry and time.time() - entry["fetched_at"] < URN_TTL_HOURS * 3600:
+            return entry["urn"]
+        response = self._request("GET", f"{self.api_base}/userinfo", headers=self._headers())
+        urn = f"urn:li:person:{response.json()['sub']}"
+        cache[self._token_id()] = {"urn": urn, "fetched_at": time.time()}
+        tmp = self.urn_cache + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp, self.urn_cache)
+        return urn
+
+    # --- Images ---
+    def register_upload(self, urn):
+        """Registers a feed image asset. Returns (upload_url, asset_urn)."""
+        payload = {
+            "registerUploadRequest": {
+                "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
+                "owner": urn,
+                "serviceRelationships": [{"relationshipType": "OWNER", "identifier": "urn:li:userGeneratedContent"}]
+            }
+        }
+        # Registering twice only leaves an unused asset behind, so this is retried like a read.
+        response = self._request("POST", f"{self.api_base}/assets?action=registerUpload",
+                                 headers=self._headers({"Content-Type": "application/json"}), json=payload)
+        value = response.json()["value"]
+        upload_url = value["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
+        return upload_url, value["asset"]
+
+    def upload(self, registration, image):
+        """
+        PUTs bytes, a file path or an ImageStream to a registered asset. Returns the asset URN.
+        Bytes and files are retried; a live stream can only be sent once.
+        """
+        upload_url, asset = registration
+        headers = {"Authorization": f"Bearer {self.token}"}
+        if isinstance(image, ImageStream):
+            self._request("PUT", upload_url, retry=False, replayable=False, timeout=UPLOAD_TIMEOUT,
+                          headers=headers, data=image.body())
+            return asset
+        if isinstance(image, str):
+            with open(image, "rb") as f:
+                image = f.read()   # bounded by MAX_IMAGE_BYTES; a bytes body can be re-sent on retry
+        self._request("PUT", upload_url, timeout=UPLOAD_TIMEOUT, headers=headers, data=image)
+        return asset
+
+    # --- Posts ---
+    def publish(self, urn, text, asset=None, key=None, media_title="Visual", media_description="Image"):
+        """
+        Publishes a text (or text + image) post and returns its URN.
+        `key` defaults to a hash of (urn, text). A key that already published raises AlreadyPublished
+        (nothing is posted); a key whose earlier outcome is still unknown raises LinkedInError.
+        """
+        key = key or idempotency_key(urn, text)
+        previous = self.ledger.get(key)
+        if previous and previous[0] == "published":
+            raise AlreadyPublished(f"Already published as {previous[1]}. Not posting again.", post_urn=previous[1])
+        if previous and self.ledger.blocked(key):
+            raise LinkedInError(f"An earlier attempt for this post may have gone through (key {key[:12]}). "
+                                f"Check LinkedIn, then run `python -m empire.linkedin reset {key[:12]}` to allow a re-post.")
+
+        share_content = {"shareCommentary": {"text": text}, "shareMediaCategory": "NONE"}
+        if asset:
+            share_content["shareMediaCategory"] = "IMAGE"
+            share_content["media"] = [{"status": "READY", "description": {"text": media_description},
+                                       "media": asset, "title": {"text": media_title}}]
+        payload = {
+            "author": urn,
+            "lifecycleState": "PUBLISHED",
+            "specificContent": {"com.linkedin.ugc.ShareContent": share_content},
+            "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
+        }
+
+        self.ledger.set(key, "pending")
+        try:
+            response = self._request("POST", f"{self.api_base}/ugcPosts", retry=False, expect=(201,),
+                                     headers=self._headers({"Content-Type": "application/json"}), json=payload)
+        except LinkedInError as e:
+            # A 4xx other than 429 is a definite rejection; anything else may have been applied.
+            definite = e.status is not None and 400 <= e.status < 500
+            self.ledger.set(key, "failed" if definite else "unknown", detail=str(e)[:500])
+            raise
+        post_urn = response.headers.get("x-restli-id") or response.headers.get("X-RestLi-Id") or ""
+        self.ledger.set(key, "published", post_urn=post_urn)
+        telemetry.count("posts.published")
+        telemetry.event("linkedin.published", post=post_urn, image=bool(asset))
+        return post_urn
+
+_PUBLISHER = None
+_PUBLISHER_LOCK = threading.Lock()
+
+def get_publisher():
+    """Process-wide publisher for LINKEDIN_ACCESS_TOKEN."""
+    global _PUBLISHER
+    with _PUBLISHER_LOCK:
+        if _PUBLISHER is None:
+            _PUBLISHER = LinkedInPublisher()
+    return _PUBLISHER
+
+if __name__ == "__main__":
+    # python -m empire.linkedin unresolved     list posts whose outcome is unknown
+    # python -m empire.linkedin reset KEY      allow a re-post after checking LinkedIn (KEY may be a prefix)
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("unresolved", [])
+    ledger = PublishLedger()
+    if command == "reset" and args:
+        print(f"🧹 Reset {ledger.reset(args[0])} unresolved key(s).")
+    else:
+        rows = ledger.unresolved()
+        for key, state, detail, updated_at in rows:
+            print(f"{key[:12]}  {state:<8} {time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(updated_at))}  {detail or ''}")
+        print(f"❔ {len(rows)} unresolved post(s).")
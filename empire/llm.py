@@ -0,0 +1,243 @@
+import asyncio
+import contextvars
+import math
+import os
+import random
+import threading
+import time
+import uuid
+import weakref
+from empire import telemetry
+from empire.net import TokenBucket
+from empire.response_cache import ResponseCache
+
+# --- 1. CONFIGURATION ---
+DEFAULT_MODEL = "gemini-1.5-flash"
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")   # the one place the key is read
+GEMINI_API_BASE = os.environ.get("GEMINI_API_BASE")   # e.g. a local stand-in (empire/mock_api.py)
+EXPECTED_OUTPUT_TOKENS = 800      # Reserved against the tokens/min budget for each call
+
+# Per-model (requests/min, tokens/min). Env overrides: LLM_RPM / LLM_TPM apply to every model.
+MODEL_LIMITS = {
+    "gemini-1.5-flash": (15, 1_000_000),
+    "gemini-2.5-flash": (10, 250_000),
+}
+DEFAULT_LIMITS = (10, 250_000)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# The SDK's own network and 5xx errors, matched by class name through the MRO so checking never imports httpx
+RETRY_ERRORS = {"httpx.TransportError", "google.genai.errors.ServerError"}
+MAX_ATTEMPTS = int(os.environ.get("LLM_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+# Response cache: "cache" serves hits and stores misses, "replay" serves only from the cache
+# (a miss raises ReplayMiss, no network), "off" always calls the API.
+# Entries are scoped to one run: a re-run of the same Actions run (same GITHUB_RUN_ID) reuses its copy,
+# while the next scheduled run writes fresh copy. Set LLM_CACHE_SCOPE to record and replay a fixed scope.
+LLM_MODE = os.environ.get("LLM_MODE", "cache").lower()
+LLM_CACHE_DB = os.environ.get("LLM_CACHE_DB", "llm_cache.db")
+LLM_CACHE_MAX_MB = float(os.environ.get("LLM_CACHE_MAX_MB", "20"))
+LLM_CACHE_SCOPE = os.environ.get("LLM_CACHE_SCOPE") or os.environ.get("GITHUB_RUN_ID") or uuid.uuid4().hex
+LLM_CACHE_TTL_HOURS = float(os.environ.get("LLM_CACHE_TTL_HOURS", "48"))   # long enough for a re-run, no longer
+_scope = contextvars.ContextVar("llm_cache_scope", default=None)   # set by new_scope(); overrides the gateway's scope
+
+class ReplayMiss(KeyError):
+    """Raised in replay mode when a prompt has no cached response."""
+
+def estimate_tokens(text):
+    return math.ceil(len(text or "") / 4)
+
+def _status_of(error):
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+def is_retryable(error):
+    if any(f"{cls.__module__}.{cls.__qualname__}" in RETRY_ERRORS for cls in type(error).__mro__):
+        return True   # httpx.ConnectError, ReadTimeout, ... inherit from neither ConnectionError nor TimeoutError
+    status = _status_of(error)
+    if status is not None:
+        return status in RETRY_STATUS
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+# --- 2. THE GATEWAY ---
+class LLMGateway:
+    """
+    One warm Gemini client per process, shared by every engine.
+    Each model gets a requests/min and a tokens/min bucket, and transient
+    failures (429 / 5xx) are retried with jittered exponential backoff.
+    Responses are cached on disk by (scope, model, prompt, config) unless mode is "off".
+    """
+
+    def __init__(self, api_key=None, mode=None, cache_path=None, scope=None):
+        self.api_key = api_key or GEMINI_API_KEY
+        self.mode = (mode or LLM_MODE).lower()
+        self.scope = scope or LLM_CACHE_SCOPE
+        self._client = None
+        self._aio = weakref.WeakKeyDictionary()   # event loop → async surface of a client made on that loop
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self.cache = None
+        if self.mode in ("cache", "replay"):
+            self.cache = ResponseCache(
+                cache_path or LLM_CACHE_DB,
+                max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024),
+                ttls={"llm": LLM_CACHE_TTL_HOURS * 3600},
+            )
+
+    def _new_client(self):
+        from google import genai   # deferred: the SDK costs ~1s to import and cache/replay hits never need it
+        http_options = {"base_url": GEMINI_API_BASE} if GEMINI_API_BASE else None
+        return genai.Client(api_key=self.api_key, http_options=http_options)
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._new_client()
+            return self._client
+
+    def _aio_client(self):
+        """
+        The async surface for the running event loop. Its transport binds to the loop it first runs on,
+        so each asyncio.run() (every generate_many call, e.g. each daemon cycle) gets its own.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._aio:
+                self._aio[loop] = self._new_client().aio
+            return self._aio[loop]
+
+    def _limits(self, model):
+        with self._lock:
+            if model not in self._limiters:
+                rpm, tpm = MODEL_LIMITS.get(model, DEFAULT_LIMITS)
+                rpm = float(os.environ.get("LLM_RPM", rpm))
+                tpm = float(os.environ.get("LLM_TPM", tpm))
+                self._limiters[model] = (TokenBucket(rpm / 60, capacity=max(rpm, 1)), TokenBucket(tpm / 60, capacity=tpm))
+            return self._limiters[model]
+
+    def _acquire(self, model, prompt):
+        requests_bucket, tokens_bucket = self._limits(model)
+        requests_bucket.acquire()
+        tokens_bucket.acquire(estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS)
+
+    def _cached(self, model, prompt, json_output, temperature):
+        """Cache lookup keyed by a hash of (scope, model, prompt, config). Returns (params, text or None)."""
+        params = {"scope": _scope.get() or self.scope, "model": model, "prompt": prompt, "json_output": json_output, "temperature": temperature}
+        if self.cache is None:
+            return params, None
+        text = self.cache.get("llm", params)
+        if text is not None:
+            self.cache.stats["hits"] += 1
+            telemetry.count("llm.cache_hits", model=model)
+            return params, text
+        self.cache.stats["misses"] += 1
+        if self.mode == "replay":
+            raise ReplayMiss(f"No cached response for {model} prompt ({estimate_tokens(prompt)} tokens)")
+        return params, None
+
+    @staticmethod
+    def _record(model, prompt, response):
+        """Call and token counters; the API's own usage numbers when it reports them."""
+        if not telemetry.ENABLED:
+            return
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+        response_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(response.text)
+        telemetry.count("llm.calls", model=model)
+        telemetry.count("llm.prompt_tokens", prompt_tokens, model=model)
+        telemetry.count("llm.response_tokens", response_tokens, model=model)
+
+    def _store(self, params, text):
+        if self.cache is not None and text is not None:
+            self.cache.put("llm", params, text)
+
+    @staticmethod
+    def _config(json_output, temperature):
+        if not json_output and temperature is None:
+            return None
+        from google.genai import types
+        return types.GenerateContentConfig(
+            response_mime_type="application/json" if json_output else None,
+            temperature=temperature,
+        )
+
+    def generate(self, prompt, model=DEFAULT_MODEL, json_output=False, temperature=None):
+        """Blocking generation. Returns the response text; raises after MAX_ATTEMPTS."""
+        params, text = self._cached(model, prompt, json_output, temperature)
+        if text is not None:
+            return text
+        config = self._config(json_output, temperature)
+        for attempt in range(MAX_ATTEMPTS):
+            self._acquire(model, prompt)
+            try:
+                with telemetry.span("llm.generate", model=model):
+                    response = self.client.models.generate_content(model=model, contents=prompt, config=config)
+                self._record(model, prompt, response)
+                self._store(params, response.text)
+                return response.text
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS - 1 or not is_retryable(e):
+                    raise
+                delay = backoff_delay(attempt)
+                telemetry.count("llm.retries", model=model)
+                print(f"⏳ Gemini busy ({_status_of(e) or type(e).__name__}). Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    async def agenerate(self, prompt, model=DEFAULT_MODEL, json_output=False, temperature=None):
+        """Async generation on the client's aio surface; rate limiting waits happen off the event loop."""
+        params, text = self._cached(model, prompt, json_output, temperature)
+        if text is not None:
+            return text
+        config = self._config(json_output, temperature)
+        for attempt in range(MAX_ATTEMPTS):
+            await asyncio.to_thread(self._acquire, model, prompt)
+            try:
+                with telemetry.span("llm.generate", model=model):
+                    response = await self._aio_client().models.generate_content(model=model, contents=prompt, config=config)
+                self._record(model, prompt, response)
+                self._store(params, response.text)
+                return response.text
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS - 1 or not is_retryable(e):
+                    raise
+                delay = backoff_delay(attempt)
+                telemetry.count("llm.retries", model=model)
+                print(f"⏳ Gemini busy ({_status_of(e) or type(e).__name__}). Retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+
+    def generate_many(self, prompts, model=DEFAULT_MODEL, json_output=False, temperature=None):
+        """Runs several generations concurrently. Failed items come back as the raised exception."""
+        async def run():
+            return await asyncio.gather(
+                *(self.agenerate(p, model, json_output, temperature) for p in prompts),
+                return_exceptions=True,
+            )
+        return asyncio.run(run())
+
+_GATEWAY = None
+_GATEWAY_LOCK = threading.Lock()
+
+def new_scope():
+    """
+    Starts a fresh cache scope for the current context only, e.g. one daemon cycle (its own task), so concurrent
+    cycles sharing the gateway never see each other's copy. An explicit LLM_CACHE_SCOPE is kept.
+    """
+    if not os.environ.get("LLM_CACHE_SCOPE"):
+        _scope.set(uuid.uuid4().hex)
+
+def get_gateway():
+    """Process-wide gateway, so every engine shares the same client and limiters."""
+    global _GATEWAY
+    with _GATEWAY_LOCK:
+        if _GATEWAY is None:
+            _GATEWAY = LLMGateway()
+    return _GATEWAY
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import time
+import numpy as np
+
+# --- 1. CONFIGURATION ---
+MARKET_DATA_DIR = os.environ.get("MARKET_DATA_DIR", "market_data")
+MARKET_DATA_SOURCE = os.environ.get("MARKET_DATA_SOURCE", "yfinance")   # or "local" (offline stand-in)
+DEFAULT_LOOKBACK_DAYS = 60
+DAY = 86400
+
+# One fixed-width record per daily bar; files are raw arrays of these, readable with np.memmap.
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),        # UTC midnight of the bar, epoch seconds
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+def day_floor(ts):
+    return int(ts) // DAY * DAY
+
+# --- 2. DATA SOURCES ---
+class YFinanceSource:
+    """Live bars from Yahoo Finance, every ticker in a single yf.download call."""
+
+    def fetch(self, tickers, start_ts):
+        import yfinance as yf
+        start = time.strftime("%Y-%m-%d", time.gmtime(start_ts))
+        data = yf.download(list(tickers), start=start, interval="1d", group_by="ticker",
+                           auto_adjust=False, progress=False, threads=True)
+        out = {}
+        if data is None or data.empty:
+            return out
+        present = set(data.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in present:
+                continue
+            frame = data[ticker].dropna(subset=["Close"])
+            if frame.empty:
+                continue
+            bars = np.empty(len(frame), dtype=BAR_DTYPE)
+            bars["ts"] = frame.index.values.astype("datetime64[D]").astype("datetime64[s]").astype(np.int64)
+            for col in ("open", "high", "low", "close", "volume"):
+                bars[col] = frame[col.capitalize()].to_numpy(dtype=np.float64)
+            out[ticker] = bars
+        return out
+
+class LocalSource:
+    """
+    Deterministic offline stand-in: a seeded synthetic price series per ticker, one bar per calendar day up to today.
+    The same (ticker, day) always produces the same bar, so incremental syncs line up with full ones.
+    """
+
+    def __init__(self, volatility=0.03, now=None):
+        self.volatility = volatility
+        self.now = now
+        self.calls = 0
+
+    def _bar(self, ticker, ts):
+        name_seed = int.from_bytes(hashlib.blake2b(ticker.encode(), digest_size=8).digest(), "little")
+        day_seed = int.from_bytes(hashlib.blake2b(f"{ticker}:{ts}".encode(), digest_size=8).digest(), "little")
+        rng = np.random.default_rng(day_seed)
+        day = ts / DAY
+        phase = (name_seed % 1000) / 100
+        # Smooth deterministic trend plus daily noise, so neighbouring days look like a price series.
+        log_move = 0.15 * np.sin(day / 9 + phase) + 0.07 * np.sin(day / 3.1 + 2 * phase) + rng.normal(0, self.volatility)
+        close = (20 + name_seed % 480) * float(np.exp(log_move))
+        spread = close * self.volatility
+        open_ = close + spread * rng.uniform(-1, 1)
+        return (ts, open_, max(open_, close) + spread * rng.random(), min(open_, close) - spread * rng.random(),
+                close, float(rng.integers(100_000, 10_000_000)))
+
+    def fetch(self, tickers, start_ts):
+        self.calls += 1
+        end = day_floor(self.now if self.now is not None else time.time())
+        days = range(day_floor(start_ts), end + 1, DAY)
+        return {t: np.array([self._bar(t, ts) for ts in days], dtype=BAR_DTYPE) for t in tickers}
+
+def default_source():
+    return LocalSource() if MARKET_DATA_SOURCE == "local" else YFinanceSource()
+
+# --- 3. THE LEDGER (Per-Ticker Bar Files) ---
+class MarketDataStore:
+    """
+    Incremental local cache of daily bars, one memory-mappable file per ticker.
+    sync() only asks the source for bars since each ticker's last stored bar (the last bar is
+    re-fetched because today's bar is still moving) and writes them in place at the tail.
+    Reads never touch the network.
+    """
+
+    def __init__(self, root=MARKET_DATA_DIR, source=None):
+        self.root = root
+        self.source = source or default_source()
+        self.synced = set()   # tickers already brought up to date by this process
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, ticker):
+        safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in ticker)
+        return os.path.join(self.root, f"{safe}.bars")
+
+    def bars(self, ticker):
+        """All stored bars for `ticker` as a read-only memmap (empty array if none)."""
+        path = self._path(ticker)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r")
+
+    def last_ts(self, ticker):
+        bars = self.bars(ticker)
+        return int(bars["ts"][-1]) if len(bars) else None
+
+    def _write_tail(self, ticker, new_bars):
+        """Overwrites stored bars from the first new timestamp onward, appending the rest."""
+        path = self._path(ticker)
+        existing = self.bars(ticker)
+        keep = int(np.searchsorted(existing["ts"], new_bars["ts"][0])) if len(existing) else 0
+        del existing   # release the memmap before writing
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(keep * BAR_DTYPE.itemsize)
+            f.write(np.ascontiguousarray(new_bars).tobytes())
+            f.truncate()
+        return len(new_bars)
+
+    def sync(self, tickers, lookback_days=DEFAULT_LOOKBACK_DAYS):
+        """
+        Brings every ticker up to date with a single source call.
+        Returns {ticker: bars_written}.
+        """
+        cold_start = day_floor(time.time()) - lookback_days * DAY
+        starts = {t: (self.last_ts(t) or cold_start) for t in tickers}
+        fetched = self.source.fetch(tickers, min(starts.values()))
+
+        written = {}
+        for ticker in tickers:
+            new = fetched.get(ticker)
+            if new is None or len(new) == 0:
+                written[ticker] = 0
+                continue
+            new = np.sort(new[new["ts"] >= starts[ticker]], order="ts")
+            written[ticker] = self._write_tail(ticker, new) if len(new) else 0
+        self.synced.update(tickers)
+        return written
+
+    def history(self, ticker, days=None):
+        bars = self.bars(ticker)
+        return bars if days is None else bars[-days:]
+
+    def closes(self, ticker, days=None):
+        """(dates as datetime64[s], closes) for charting."""
+        bars = self.history(ticker, days)
+        return bars["ts"].astype("datetime64[s]"), np.asarray(bars["close"])
+
+    def panel(self, tickers, days, field="close"):
+        """
+        Aligned (n_tickers, days) matrix of `field`, right-aligned on each ticker's latest bar.
+        Missing history is NaN. Used by the quant engine to process a whole universe at once.
+        """
+        out = np.full((len(tickers), days), np.nan)
+        for i, ticker in enumerate(tickers):
+            values = np.asarray(self.history(ticker, days)[field])
+            if len(values):
+                out[i, -len(values):] = values
+        return out
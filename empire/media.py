@@ -0,0 +1,115 @@
+import os
+from empire.net import get_session
+
+# --- 1. CONFIGURATION ---
+MAX_IMAGE_BYTES = int(float(os.environ.get("MAX_IMAGE_MB", "8")) * 1024 * 1024)
+CHUNK_SIZE = 64 * 1024
+KEEP_MEDIA_FILES = os.environ.get("KEEP_MEDIA_FILES", "0") == "1"   # also write a local copy, for debugging
+
+class MediaRejected(ValueError):
+    """The remote file is too large, or is not an image we can post."""
+
+# --- 2. VALIDATION ---
+def sniff_image_type(head):
+    """MIME type from the file's magic bytes, or None if it is not a supported image."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+# --- 3. STREAMED DOWNLOAD ---
+class ImageStream:
+    """
+    A validated, size-capped image download that is consumed chunk by chunk.
+    Iterating it yields the body; passing `stream.body()` as `data=` to requests streams
+    it straight into the upload without holding the whole file in memory.
+    """
+
+    def __init__(self, response, head, mime, max_bytes):
+        self.response = response
+        self.head = head
+        self.mime = mime
+        self.max_bytes = max_bytes
+        declared = response.headers.get("Content-Length")
+        encoded = response.headers.get("Content-Encoding", "identity").lower() != "identity"
+        # A compressed transfer decodes to a different size than declared, so fall back to chunked.
+        self.length = int(declared) if declared and declared.isdigit() and not encoded else None
+        self.bytes_read = 0
+
+    def __iter__(self):
+        chunks = self.response.iter_content(CHUNK_SIZE)
+        try:
+            yield from self._counted(self.head)
+            for chunk in chunks:
+                yield from self._counted(chunk)
+        finally:
+            self.response.close()
+
+    def _counted(self, chunk):
+        if not chunk:
+            return
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_bytes:
+            raise MediaRejected(f"Image exceeds {self.max_bytes} bytes")
+        yield chunk
+
+    def body(self):
+        """Upload body: sized (Content-Length) when the server declared one, chunked otherwise."""
+        return _SizedBody(self) if self.length is not None else iter(self)
+
+    def read_all(self):
+        return b"".join(self)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            for chunk in self:
+                f.write(chunk)
+        return path
+
+class _SizedBody:
+    """requests sends Content-Length for objects with __len__ and still streams them via __iter__."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __len__(self):
+        return self.stream.length
+
+    def __iter__(self):
+        return iter(self.stream)
+
+def open_image_stream(url, max_bytes=MAX_IMAGE_BYTES, timeout=10):
+    """
+    Starts a streamed GET and validates it before any body is handed on:
+    Content-Type must be an image (or generic binary), Content-Length must fit the cap,
+    and the first bytes must carry a known image signature.
+    """
+    resp = get_session().get(url, stream=True, timeout=timeout)
+    try:
+        resp.raise_for_status()
+        ctype = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if ctype and not (ctype.startswith("image/") or ctype == "application/octet-stream"):
+            raise MediaRejected(f"Unexpected content type '{ctype}'")
+        declared = resp.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise MediaRejected(f"Image is {declared} bytes (cap {max_bytes})")
+
+        head = b""
+        for chunk in resp.iter_content(64):
+            head += chunk
+            if len(head) >= 12:
+                break
+        mime = sniff_image_type(head)
+        if mime is None:
+            raise MediaRejected("Body is not a JPEG/PNG/GIF/WebP image")
+    except Exception:
+        resp.close()
+        raise
+    # The abandoned 64-byte iterator and the ImageStream's own one read the same raw stream in order.
+    return ImageStream(resp, head, mime, max_bytes)
+
@@ -0,0 +1,363 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# --- 1. CONFIGURATION ---
+# Typical round trips of the real services (ms); each call sleeps this ±JITTER.
+DEFAULT_LATENCY_MS = {
+    "cse": 250,
+    "linkedin": 200,
+    "gemini": 1500,
+    "hf": 4000,
+    "media": 150,
+    "telegram": 120,   # per 100-message page
+}
+JITTER = 0.25
+MOCK_PORT = int(os.environ.get("MOCK_PORT", "8787"))
+MOCK_TG_MESSAGES = int(os.environ.get("MOCK_TG_MESSAGES", "200"))   # posts per channel
+IMAGE_SIZE = (1600, 1000)
+
+def parse_spec(text, cast=float):
+    """
+    "cse=200,gemini=800" → {"cse": 200.0, "gemini": 800.0}. A bare value ("50") applies to every API.
+    Used for both --latency (ms) and --errors (probability 0-1).
+    """
+    spec = {}
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, value = part.rpartition("=")
+        spec[name.strip() or "*"] = cast(value)
+    return spec
+
+class Faults:
+    """Latency and error injection per API, from parse_spec() dicts."""
+
+    def __init__(self, latency=None, errors=None, seed=None):
+        self.latency = dict(DEFAULT_LATENCY_MS)
+        if latency and "*" in latency:
+            self.latency = {api: latency["*"] for api in self.latency}
+        self.latency.update({k: v for k, v in (latency or {}).items() if k != "*"})
+        self.errors = dict(errors or {})
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(parse_spec(os.environ.get("MOCK_LATENCY")), parse_spec(os.environ.get("MOCK_ERRORS")))
+
+    def delay(self, api):
+        ms = self.latency.get(api, 0)
+        with self.lock:
+            return max(ms * self.rng.uniform(1 - JITTER, 1 + JITTER), 0) / 1000
+
+    def fail(self, api):
+        rate = self.errors.get(api, self.errors.get("*", 0))
+        with self.lock:
+            return rate > 0 and self.rng.random() < rate
+
+# --- 2. CANNED PAYLOADS ---
+_images = {}
+_images_lock = threading.Lock()
+
+def image_bytes(fmt="JPEG", size=IMAGE_SIZE):
+    """A smooth gradient image, generated once per (format, size)."""
+    with _images_lock:
+        if (fmt, size) not in _images:
+            from PIL import Image
+            g = Image.linear_gradient("L").resize((256, 256))
+            img = Image.merge("RGB", (g, g.rotate(90), g.transpose(Image.FLIP_TOP_BOTTOM))).resize(size)
+            buf = io.BytesIO()
+            img.save(buf, format=fmt, quality=90)
+            _images[(fmt, size)] = buf.getvalue()
+        return _images[(fmt, size)]
+
+SLUG = re.compile(r"[^a-z0-9]+")
+HEADLINE_WORDS = ["raises", "launches", "open-sources", "benchmarks", "acquires", "rethinks", "ships", "cuts"]
+COMPANIES = ["Qualcomm", "Zoho", "Infosys", "Atlassian", "Razorpay", "Swiggy", "Adobe", "Intuit", "Cisco", "Oracle"]
+ROLES = ["SDE-1", "Associate Engineer", "Data Analyst", "Backend Intern", "QA Engineer", "Cloud Engineer"]
+CITIES = ["Bengaluru", "Hyderabad", "Pune", "Chennai", "Remote"]
+
+def cse_items(params, base_url):
+    query = params.get("q", ["news"])[0]
+    num = int(params.get("num", ["3"])[0])
+    start = int(params.get("start", ["1"])[0])
+    slug = SLUG.sub("-", query.lower()).strip("-")
+    if params.get("searchType", [""])[0] == "image":
+        return [{"link": f"{base_url}/media/{slug}-{i}.jpg", "mime": "image/jpeg"} for i in range(num)]
+    published = datetime.now(timezone.utc).isoformat()
+    items = []
+    for i in range(start, start + num):
+        verb = HEADLINE_WORDS[(len(slug) + i) % len(HEADLINE_WORDS)]
+        items.append({
+            "title": f"{COMPANIES[i % len(COMPANIES)]} {verb} {query}",
+            "link": f"https://news.example.com/{slug}/{i}",
+            "snippet": f"Analysts say the move on {query} could reshape the market within a year. " * 2,
+            "pagemap": {"metatags": [{"article:published_time": published}]},
+        })
+    return items
+
+def prompt_text(request):
+    return "\n".join(part.get("text", "") for content in request.get("contents") or [] if isinstance(content, dict)
+                     for part in content.get("parts") or [])
+
+def gemini_text(request, sample=0):
+    """
+    A plausible reply: JSON for json-mode calls (the editor's pick), else a post-length block of text
+    built from the prompt (its company or topic plus a prompt hash) and `sample`, so that, as with the
+    real model, different prompts and repeated calls give different posts.
+    """
+    config = request.get("generationConfig") or {}
+    if config.get("responseMimeType") == "application/json":
+        return json.dumps({"id": 0, "reason": "Stand-in editor: first story wins."})
+    prompt = prompt_text(request)
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+    subject = next((c for c in COMPANIES if c in prompt), None)
+    if subject is None:
+        topic = re.search(r"(?:topic|about|on)[:\s]+['\"]?([^'\"\n.]{3,60})", prompt, re.I)
+        subject = topic.group(1).strip() if topic else "This"
+    lines = [f"{subject}: most teams are measuring the wrong thing.", ""]
+    lines += [f"{n}. The bottleneck is rarely where the dashboard says it is." for n in range(1, 6)]
+    lines += ["", "What would you measure first?", "", f"#Engineering #Performance #Leadership (ref {digest}-{sample})"]
+    return "\n".join(lines)
+
+# --- 3. THE STAND-IN (HTTP Server) ---
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real APIs
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", ctype="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        self.server.api.count(self.api, bytes_out=len(body))
+
+    def _route(self):
+        url = urlsplit(self.path)
+        self.api = url.path.strip("/").split("/", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        mock = self.server.api
+        mock.count(self.api, requests=1, bytes_in=len(body))
+
+        time.sleep(mock.faults.delay(self.api))
+        if mock.faults.fail(self.api):
+            mock.count(self.api, errors=1)
+            status = mock.faults.rng.choice([429, 503])
+            error = {"error": {"code": status, "message": "Injected fault", "status": "UNAVAILABLE"}}
+            return self._send(status, error, headers={"Retry-After": "0"})
+
+        handler = getattr(self, f"_{self.api}", None)
+        if handler is None:
+            return self._send(404, {"error": f"no stand-in for {url.path}"})
+        return handler(url, parse_qs(url.query), body)
+
+    do_GET = do_POST = do_PUT = do_HEAD = _route
+
+    def _cse(self, url, params, body):
+        self._send(200, {"items": cse_items(params, self.server.api.url)})
+
+    def _media(self, url, params, body):
+        self._send(200, image_bytes("JPEG"), ctype="image/jpeg")
+
+    def _hf(self, url, params, body):
+        self._send(200, image_bytes("PNG", (1024, 1024)), ctype="image/png")
+
+    def _gemini(self, url, params, body):
+        model = url.path.rsplit("/", 1)[-1].split(":", 1)[0]
+        request = json.loads(body or b"{}")
+        prompt = json.dumps(request.get("contents", ""))
+        text = gemini_text(request, self.server.api.next_id())
+        self._send(200, {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4,
+                              "totalTokenCount": (len(prompt) + len(text)) // 4},
+            "modelVersion": model,
+        })
+
+    def _linkedin(self, url, params, body):
+        mock = self.server.api
+        path = url.path
+        if path.endswith("/userinfo"):
+            return self._send(200, {"sub": "mock-member", "name": "Stand-in Member"})
+        if path.endswith("/assets") and params.get("action") == ["registerUpload"]:
+            n = mock.next_id()
+            return self._send(200, {"value": {
+                "asset": f"urn:li:digitalmediaAsset:mock{n}",
+                "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                    "uploadUrl": f"{mock.url}/linkedin/upload/{n}"}},
+            }})
+        if "/upload/" in path and self.command == "PUT":
+            return self._send(201, b"")
+        if path.endswith("/ugcPosts") and self.command == "POST":
+            n = mock.next_id()
+            mock.count("linkedin", posts=1)
+            return self._send(201, {}, headers={"x-restli-id": f"urn:li:share:{n}"})
+        self._send(404, {"message": f"no stand-in for {self.command} {path}"})
+
+class MockAPI:
+    """
+    Local stand-in for Google CSE, Gemini, Hugging Face, LinkedIn and image hosts, on one port.
+    Every call sleeps the API's configured latency and fails (429/503 with Retry-After: 0) at its
+    configured error rate. env() gives the variables that point the engines at it.
+    """
+
+    def __init__(self, latency=None, errors=None, host="127.0.0.1", port=0, seed=None):
+        self.faults = Faults(latency, errors, seed)
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.api = self
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self.stats = {}
+        self._ids = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def env(self):
+        spec = lambda d: ",".join(f"{k}={v}" for k, v in d.items())
+        return {
+            "CSE_ENDPOINT": f"{self.url}/cse/customsearch/v1",
+            "GEMINI_API_BASE": f"{self.url}/gemini/",
+            "LINKEDIN_API_BASE": f"{self.url}/linkedin/v2",
+            "ART_INFERENCE_URL": f"{self.url}/hf/models/flux",
+            # Telegram is MTProto, not HTTP; MockTelegramClient reads its faults from these
+            "MOCK_LATENCY": spec(self.faults.latency),
+            "MOCK_ERRORS": spec(self.faults.errors),
+        }
+
+    def count(self, api, **amounts):
+        with self._lock:
+            row = self.stats.setdefault(api, {"requests": 0, "errors": 0, "bytes_in": 0, "bytes_out": 0, "posts": 0})
+            for key, value in amounts.items():
+                row[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {api: dict(row) for api, row in self.stats.items()}
+
+    def next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+# --- 4. THE STAND-IN (Telegram) ---
+class MockMessage:
+    def __init__(self, id, text, date):
+        self.id = id
+        self.text = text
+        self.date = date
+
+def job_posts(channel, n, seed=0):
+    """
+    `n` synthetic channel posts, oldest first: mostly job alerts, some promos, and a share of
+    alerts cross-posted verbatim from a shared pool (so cross-channel dedupe has work to do).
+    """
+    rng = random.Random(f"{channel}:{seed}")
+    shared = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    posts = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.15:
+            text = f"Join our channel for daily updates! https://t.me/{channel} 🔥 Subscribe now"
+        else:
+            source = shared if roll < 0.3 else rng
+            k = source.randrange(10_000)
+            company, role = COMPANIES[k % len(COMPANIES)], ROLES[k % len(ROLES)]
+            text = (f"🚨 {company} is Hiring Freshers!\n🔹 Role : {role}\n🔹 Batch : {2023 + k % 3}\n"
+                    f"🔹 Location: {CITIES[k % len(CITIES)]}\n🔹 CTC: {4 + k % 20} LPA\n"
+                    f"🔗 Apply Link: https://careers.{company.lower()}.com/job/{k}?utm_source=telegram")
+        posts.append(MockMessage(i + 1, text, now - timedelta(minutes=(n - i) * 5)))
+    return posts
+
+class MockTelegramClient:
+    """
+    Drop-in for the slice of TelegramClient the listener uses: `async with` and iter_messages().
+    Messages arrive in 100-message pages, each costing the "telegram" latency; a faulted page raises
+    a 1-second FloodWaitError, as Telegram does.
+    """
+
+    PAGE = 100
+
+    def __init__(self, faults=None, messages=MOCK_TG_MESSAGES):
+        self.faults = faults or Faults()
+        self.messages = messages
+        self._channels = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(Faults.from_env())
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.faults.delay("telegram"))   # connect + auth
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def start(self):
+        return await self.__aenter__()
+
+    async def disconnect(self):
+        pass
+
+    async def iter_messages(self, channel, min_id=None, offset_date=None, reverse=False, limit=None):
+        posts = self._channels.setdefault(channel, job_posts(channel, self.messages))
+        selected = [m for m in posts if (not min_id or m.id > min_id) and (not offset_date or m.date >= offset_date)]
+        if not reverse:
+            selected.reverse()
+        for start in range(0, len(selected[:limit]), self.PAGE):
+            await asyncio.sleep(self.faults.delay("telegram"))
+            if self.faults.fail("telegram"):
+                from telethon.errors import FloodWaitError
+                raise FloodWaitError(request=None, capture=1)
+            for message in selected[start:start + self.PAGE]:
+                yield message
+
+if __name__ == "__main__":
+    # python -m empire.mock_api [--port 8787] [--latency cse=200,gemini=800] [--errors linkedin=0.05]
+    args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    mock = MockAPI(parse_spec(args.get("--latency")), parse_spec(args.get("--errors")),
+                   port=int(args.get("--port", MOCK_PORT)))
+    print(f"🧪 Stand-in APIs listening on {mock.url}. Point the engines at it with:")
+    for name, value in mock.env().items():
+        print(f"   export {name}='{value}'")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(mock.snapshot())}")
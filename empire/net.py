@@ -0,0 +1,60 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from empire import telemetry
+
+# --- 1. POOLED SESSION (Keep-Alive) ---
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def get_session(pool_size=16):
+    """
+    Returns the process-wide requests.Session.
+    Connections are kept alive and reused, so only the first call to a host pays for TLS.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if telemetry.ENABLED:
+                session.hooks["response"].append(telemetry.count_response)
+            _SESSION = session
+    return _SESSION
+
+# --- 2. CLIENT-SIDE RATE LIMITER ---
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    `rate` tokens are added per second up to `capacity`; acquire() blocks until enough are available.
+    A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        if self.rate <= 0:
+            return
+        # Requests larger than the bucket would wait forever; clamp them to a full bucket.
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
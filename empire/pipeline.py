@@ -0,0 +1,139 @@
+import contextvars
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from empire import telemetry
+
+TIMINGS_FILE = os.environ.get("PIPELINE_TIMINGS_FILE")   # appends one JSON line per run (read by empire/benchmark.py)
+
+# --- 1. STAGE GRAPH ---
+class Stage:
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+class Pipeline:
+    """
+    Small declarative stage graph.
+    Each stage is a function whose keyword arguments are the results of the stages it depends on:
+
+        flow = Pipeline("news")
+        flow.add("search", search_the_web_for_news)
+        flow.add("select", lambda search: pick(search), deps=["search"])
+        run = flow.run()
+
+    Ready stages run concurrently on a thread pool. A stage that raises (including SystemExit)
+    stops the run and the exception is re-raised to the caller.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+
+    def add(self, name, fn, deps=()):
+        missing = [d for d in deps if d not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {missing}")
+        self.stages[name] = Stage(name, fn, deps)
+        return self
+
+    def stage(self, name, deps=()):
+        """Decorator form of add()."""
+        def register(fn):
+            self.add(name, fn, deps)
+            return fn
+        return register
+
+    def run(self, max_workers=4, report=True):
+        with telemetry.span(f"pipeline.{self.name}"):
+            return self._run(max_workers, report)
+
+    def _run(self, max_workers, report):
+        run = PipelineRun(self)
+        pending = dict(self.stages)
+        running = {}
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.name)
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(d in run.results for d in stage.deps):
+                        kwargs = {d: run.results[d] for d in stage.deps}
+                        # Each stage runs in a copy of this context, so its span nests under the pipeline's
+                        running[pool.submit(contextvars.copy_context().run, run.execute, stage, kwargs)] = name
+                        del pending[name]
+
+                if not running:
+                    raise RuntimeError(f"Pipeline '{self.name}' is stuck on: {sorted(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    run.results[name] = future.result()   # re-raises the stage's exception
+        finally:
+            pool.shutdown(wait=not running, cancel_futures=True)
+            run.finished = time.perf_counter()
+            if report:
+                run.print_report()
+            if TIMINGS_FILE:
+                run.dump(TIMINGS_FILE)
+        return run
+
+# --- 2. RUN RECORD ---
+class PipelineRun:
+    """Results plus per-stage (start, end) offsets, and the critical path once the run is over."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.results = {}
+        self.timings = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def execute(self, stage, kwargs):
+        start = time.perf_counter() - self.started
+        try:
+            with telemetry.span(f"{self.pipeline.name}.{stage.name}"):
+                return stage.fn(**kwargs)
+        finally:
+            self.timings[stage.name] = (start, time.perf_counter() - self.started)
+
+    def critical_path(self):
+        """
+        Walks back from the last stage to finish, each time following the dependency that finished last.
+        These are the stages whose duration directly set the end-to-end time.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        path = [name]
+        while True:
+            deps = [d for d in self.pipeline.stages[name].deps if d in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda d: self.timings[d][1])
+            path.append(name)
+        return list(reversed(path))
+
+    def stage_report(self):
+        critical = set(self.critical_path())
+        rows = []
+        for name, (start, end) in sorted(self.timings.items(), key=lambda kv: kv[1][0]):
+            rows.append({"stage": name, "start_s": round(start, 4), "wall_s": round(end - start, 4), "critical": name in critical})
+        return rows
+
+    def dump(self, path):
+        total = (self.finished or time.perf_counter()) - self.started
+        record = {"pipeline": self.pipeline.name, "total_s": round(total, 4),
+                  "stages": self.stage_report(), "critical_path": self.critical_path()}
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def print_report(self):
+        total = (self.finished or time.perf_counter()) - self.started
+        print(f"\n⏱️ {self.pipeline.name} pipeline: {total:.2f}s end-to-end")
+        for row in self.stage_report():
+            marker = "🔥" if row["critical"] else "  "
+            print(f"   {marker} {row['stage']:<12} start {row['start_s']:>7.2f}s  wall {row['wall_s']:>7.2f}s")
+        print(f"   Critical path: {' → '.join(self.critical_path())}")
@@ -0,0 +1,98 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- 1. CONFIGURATION ---
+PUBLISH_QUEUE_DB = os.environ.get("PUBLISH_QUEUE_DB", "publish_queue.db")
+POST_INTERVAL_MINUTES = float(os.environ.get("POST_INTERVAL_MINUTES", "180"))   # cadence between queued posts
+RETRY_MINUTES = 15
+MAX_ATTEMPTS = 3
+
+# --- 2. THE OUTBOX (SQLite Queue) ---
+class PublishQueue:
+    """
+    Durable queue of ready-to-publish posts, each with a scheduled time.
+    Batch runs enqueue() many posts spaced POST_INTERVAL_MINUTES apart; a cheap drain run
+    publishes whatever is due(). Failed items are retried RETRY_MINUTES later, up to MAX_ATTEMPTS.
+    """
+
+    def __init__(self, path=PUBLISH_QUEUE_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS queue ("
+            " id INTEGER PRIMARY KEY, source TEXT NOT NULL, payload TEXT NOT NULL,"
+            " due_at REAL NOT NULL, status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT,"
+            " created_at REAL NOT NULL, published_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS queue_due ON queue(due_at) WHERE status = 'pending'")
+        self.db.commit()
+
+    def next_slot(self, interval_minutes=POST_INTERVAL_MINUTES, now=None):
+        """The first free publish time: now, or one interval after the last pending post."""
+        now = now or time.time()
+        with self.lock:
+            last = self.db.execute("SELECT MAX(due_at) FROM queue WHERE status = 'pending'").fetchone()[0]
+        return now if last is None else max(now, last + interval_minutes * 60)
+
+    def enqueue(self, source, payload, due_at=None):
+        """Adds one post (`payload` is any JSON-able dict). Returns its queue id."""
+        now = time.time()
+        with self.lock:
+            cur = self.db.execute(
+                "INSERT INTO queue (source, payload, due_at, created_at) VALUES (?, ?, ?, ?)",
+                (source, json.dumps(payload, ensure_ascii=False), due_at or now, now),
+            )
+            self.db.commit()
+        return cur.lastrowid
+
+    def enqueue_many(self, source, payloads, interval_minutes=POST_INTERVAL_MINUTES):
+        """Schedules `payloads` one interval apart, after anything already pending. Returns [(id, due_at)]."""
+        due_at = self.next_slot(interval_minutes)
+        scheduled = []
+        for payload in payloads:
+            scheduled.append((self.enqueue(source, payload, due_at), due_at))
+            due_at += interval_minutes * 60
+        return scheduled
+
+    def due(self, limit=1, now=None):
+        """Pending items whose time has come, oldest first."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT * FROM queue WHERE status = 'pending' AND due_at <= ? ORDER BY due_at LIMIT ?",
+                (now or time.time(), limit),
+            ).fetchall()
+        return [dict(row, payload=json.loads(row["payload"])) for row in rows]
+
+    def mark_published(self, item_id):
+        with self.lock:
+            self.db.execute(
+                "UPDATE queue SET status = 'published', published_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (time.time(), item_id),
+            )
+            self.db.commit()
+
+    def mark_failed(self, item_id, error):
+        """Reschedules the item, or gives up on it after MAX_ATTEMPTS. Returns True if it will be retried."""
+        with self.lock:
+            attempts = self.db.execute("SELECT attempts FROM queue WHERE id = ?", (item_id,)).fetchone()[0] + 1
+            retry = attempts < MAX_ATTEMPTS
+            self.db.execute(
+                "UPDATE queue SET attempts = ?, last_error = ?, status = ?, due_at = ? WHERE id = ?",
+                (attempts, str(error)[:500], "pending" if retry else "failed", time.time() + RETRY_MINUTES * 60, item_id),
+            )
+            self.db.commit()
+        return retry
+
+    def pending_count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM queue WHERE status = 'pending'").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,115 @@
+import sys
+import time
+import numpy as np
+
+# --- 1. CONFIGURATION ---
+TRADING_DAYS = 252
+VOL_WINDOW = 20
+RSI_PERIOD = 14
+VOLUME_WINDOW = 20
+
+# --- 2. THE QUANT DESK (Vectorized Analytics) ---
+def _nan_zscore(latest, history):
+    mean = np.nanmean(history, axis=1)
+    std = np.nanstd(history, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (latest - mean) / std
+    return np.where(np.isfinite(z), z, 0.0)
+
+def rsi(closes, period=RSI_PERIOD):
+    """Wilder RSI of the latest bar for every row. The loop runs over time; each step is vectorized across symbols."""
+    deltas = np.diff(closes, axis=1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    n, steps = deltas.shape
+    if steps < period:
+        return np.full(n, np.nan)
+
+    avg_gain = np.nanmean(gains[:, :period], axis=1)
+    avg_loss = np.nanmean(losses[:, :period], axis=1)
+    for t in range(period, steps):
+        g, l = gains[:, t], losses[:, t]
+        valid = ~np.isnan(deltas[:, t])
+        avg_gain = np.where(valid, (avg_gain * (period - 1) + g) / period, avg_gain)
+        avg_loss = np.where(valid, (avg_loss * (period - 1) + l) / period, avg_loss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+    return np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + rs))
+
+def analyze_universe(closes, volumes):
+    """
+    One pass over an (n_symbols, n_days) close/volume panel (NaN where a symbol has no bar).
+    Returns a dict of per-symbol arrays: last, ret_1d, ret_5d, ret_period, realized_vol,
+    move_z, rsi, drawdown, max_drawdown, volume_z and unusual (the ranking score).
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_ret = np.diff(np.log(closes), axis=1)
+
+    window = log_ret[:, -VOL_WINDOW - 1:-1]                 # excludes today, so today's move is judged against it
+    daily_vol = np.nanstd(window, axis=1)
+    latest = log_ret[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        move_z = latest / daily_vol
+    move_z = np.where(np.isfinite(move_z), move_z, 0.0)
+
+    peak = np.fmax.accumulate(closes, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = closes / peak - 1
+    volume_z = _nan_zscore(volumes[:, -1], volumes[:, -VOLUME_WINDOW - 1:-1])
+
+    def pct(a, b):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return a / b - 1
+
+    first_valid = np.take_along_axis(closes, np.argmax(~np.isnan(closes), axis=1)[:, None], axis=1)[:, 0]
+    stats = {
+        "last": closes[:, -1],
+        "ret_1d": np.expm1(latest),
+        "ret_5d": pct(closes[:, -1], closes[:, -6]) if closes.shape[1] > 5 else np.full(len(closes), np.nan),
+        "ret_period": pct(closes[:, -1], first_valid),
+        "realized_vol": daily_vol * np.sqrt(TRADING_DAYS),
+        "move_z": move_z,
+        "rsi": rsi(closes),
+        "drawdown": drawdowns[:, -1],
+        "max_drawdown": np.nanmin(drawdowns, axis=1),
+        "volume_z": volume_z,
+    }
+    # How unusual today is: the size of the move in sigmas, boosted by abnormal volume.
+    stats["unusual"] = np.abs(move_z) + 0.5 * np.clip(volume_z, 0, None)
+    return stats
+
+def rank_tickers(tickers, stats):
+    """Tickers ordered from most to least unusual move today."""
+    order = np.argsort(-np.nan_to_num(stats["unusual"], nan=-np.inf), kind="stable")
+    return [tickers[i] for i in order]
+
+def describe_ticker(tickers, stats, ticker):
+    """Compact numeric brief for one ticker, ready to drop into an LLM prompt."""
+    i = tickers.index(ticker)
+    s = {k: float(v[i]) for k, v in stats.items()}
+    return (
+        f"Last close {s['last']:.2f}; 1D {s['ret_1d']:+.2%} ({s['move_z']:+.1f} sigma); "
+        f"5D {s['ret_5d']:+.2%}; period {s['ret_period']:+.2%}; "
+        f"annualized realized vol {s['realized_vol']:.0%}; RSI(14) {s['rsi']:.0f}; "
+        f"drawdown from peak {s['drawdown']:.1%} (max {s['max_drawdown']:.1%}); "
+        f"volume z-score {s['volume_z']:+.1f}."
+    )
+
+def _bench(n, days=60):
+    rng = np.random.default_rng(3)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n, days)), axis=1))
+    volumes = rng.lognormal(13, 0.4, (n, days))
+    closes[rng.random((n, days)) < 0.01] = np.nan   # sprinkle gaps like a real panel
+    started = time.perf_counter()
+    stats = analyze_universe(closes, volumes)
+    elapsed = time.perf_counter() - started
+    tickers = [f"S{i}" for i in range(n)]
+    top = rank_tickers(tickers, stats)[0]
+    print(f"📊 Analyzed {n} symbols x {days} days in {elapsed * 1000:.1f} ms ({n / elapsed:,.0f} symbols/s)")
+    print(f"   Most unusual: {top} — {describe_ticker(tickers, stats, top)}")
+
+if __name__ == "__main__":
+    # python -m empire.quant [n_symbols] [days]
+    _bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5000, int(sys.argv[2]) if len(sys.argv) > 2 else 60)
@@ -0,0 +1,225 @@
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+import numpy as np
+
+# --- 1. CONFIGURATION ---
+HASH_BITS = 18
+HASH_DIM = 1 << HASH_BITS
+ENGAGEMENT_FILE = os.environ.get("ENGAGEMENT_FILE", "engagement_history.jsonl")
+RECENCY_HALF_LIFE_HOURS = 12.0
+
+# Relative weight of each signal in the final score.
+WEIGHTS = {"topic": 1.0, "recency": 0.6, "domain": 0.8, "coverage": 0.5}
+
+# Hand-tuned outlet priors in [0, 1]. Learned engagement per domain is blended on top.
+DOMAIN_PRIORS = {
+    "techcrunch.com": 0.9, "theverge.com": 0.8, "wired.com": 0.8, "arstechnica.com": 0.8,
+    "reuters.com": 0.9, "bloomberg.com": 0.9, "ft.com": 0.8, "wsj.com": 0.8,
+    "technologyreview.com": 0.9, "nature.com": 0.9, "ycombinator.com": 0.8, "a16z.com": 0.8,
+    "gartner.com": 0.7, "venturebeat.com": 0.7, "github.blog": 0.7,
+    "medium.com": 0.3, "reddit.com": 0.4, "pinterest.com": 0.0, "quora.com": 0.1,
+}
+DEFAULT_DOMAIN_PRIOR = 0.5
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_HOST = re.compile(r"^(?:[a-z][a-z0-9+.-]*:)?//(?:www\.)?([^/:?#]+)", re.IGNORECASE)
+_AGE = re.compile(r"^(\d+)\s+(minute|hour|day)s?\s+ago", re.IGNORECASE)
+
+# --- 2. FEATURE HASHING ---
+class _TokenIds(dict):
+    """token -> hashed column, memoized so repeated vocabulary costs a dict lookup."""
+
+    def __missing__(self, token):
+        idx = self[token] = zlib.crc32(token.encode("utf-8")) & (HASH_DIM - 1)
+        return idx
+
+_token_ids = _TokenIds()
+
+def hash_features(texts):
+    """
+    Sparse hashed bag-of-words in COO form: (rows, cols) int arrays, one entry per token occurrence.
+    Duplicates are intentional; bincount folds them into term frequencies.
+    """
+    lookup = _token_ids.__getitem__
+    per_doc = [list(map(lookup, _TOKEN.findall((text or "").lower()))) for text in texts]
+    lengths = np.fromiter(map(len, per_doc), dtype=np.int64, count=len(per_doc))
+    cols = np.fromiter((c for ids in per_doc for c in ids), dtype=np.int64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(per_doc), dtype=np.int64), lengths)
+    return rows, cols
+
+def tfidf(rows, cols, n_docs):
+    """Collapses COO token occurrences into L2-normalized TF-IDF (rows, cols, values)."""
+    if len(rows) == 0:
+        return rows, cols, np.zeros(0, dtype=np.float32)
+    pair = rows * HASH_DIM + cols
+    uniq, tf = np.unique(pair, return_counts=True)
+    rows, cols = uniq // HASH_DIM, uniq % HASH_DIM
+    df = np.bincount(cols, minlength=HASH_DIM)
+    idf = np.log((1 + n_docs) / (1 + df[cols])) + 1.0
+    values = (1 + np.log(tf)) * idf
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=n_docs))
+    values = values / np.maximum(norms[rows], 1e-9)
+    return rows, cols, values.astype(np.float32)
+
+# --- 3. SIGNALS ---
+def domain_of(link):
+    match = _HOST.match(link or "")
+    return match.group(1).lower() if match else ""
+
+def age_hours(candidate, now=None):
+    """Hours since publication from `published` (ISO-8601) or a 'N hours ago' snippet prefix; None if unknown."""
+    now = now or datetime.now(timezone.utc)
+    published = candidate.get("published")
+    if published:
+        try:
+            ts = datetime.fromisoformat(published.replace("Z", "+00:00"))
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            return max((now - ts).total_seconds() / 3600, 0.0)
+        except ValueError:
+            pass
+    match = _AGE.match(candidate.get("snippet") or "")
+    if match:
+        scale = {"minute": 1 / 60, "hour": 1, "day": 24}[match.group(2).lower()]
+        return int(match.group(1)) * scale
+    return None
+
+class EngagementModel:
+    """
+    Past-post engagement folded into a hashed topic vector and per-domain averages.
+    Rows of ENGAGEMENT_FILE: {"title": ..., "snippet": ..., "link": ..., "score": <float>}.
+    """
+
+    def __init__(self, path=ENGAGEMENT_FILE):
+        self.topic = np.zeros(HASH_DIM, dtype=np.float32)
+        self.domains = {}
+        if not os.path.exists(path):
+            return
+
+        records = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+        if not records:
+            return
+
+        scores = np.asarray([float(r.get("score", 0)) for r in records], dtype=np.float32)
+        centered = scores - scores.mean()
+        rows, cols = hash_features([f"{r.get('title', '')} {r.get('snippet', '')}" for r in records])
+        rows, cols, values = tfidf(rows, cols, len(records))
+        np.add.at(self.topic, cols, values * centered[rows])
+        norm = np.linalg.norm(self.topic)
+        if norm > 0:
+            self.topic /= norm
+
+        spread = float(scores.max() - scores.min()) or 1.0
+        per_domain = {}
+        for r, s in zip(records, scores):
+            per_domain.setdefault(domain_of(r.get("link")), []).append((s - scores.min()) / spread)
+        self.domains = {d: float(np.mean(v)) for d, v in per_domain.items()}
+
+_engagement = None   # (path, mtime, model)
+_engagement_lock = threading.Lock()
+
+def get_engagement_model(path=ENGAGEMENT_FILE):
+    """EngagementModel for `path`, loaded once and reloaded only when the file changes."""
+    global _engagement
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    with _engagement_lock:
+        if _engagement is None or _engagement[:2] != (path, mtime):
+            _engagement = (path, mtime, EngagementModel(path))
+        return _engagement[2]
+
+# --- 4. THE SCOUT (Batch Scoring) ---
+class CandidateBatch:
+    """Per-candidate features as flat arrays. Built once; scoring is then pure NumPy."""
+
+    def __init__(self, candidates, now=None):
+        n = self.size = len(candidates)
+        rows, cols = hash_features([f"{c.get('title') or ''} {c.get('snippet') or ''}" for c in candidates])
+        self.rows, self.cols, self.values = tfidf(rows, cols, n)
+        self.ages = np.asarray([age_hours(c, now) for c in candidates], dtype=np.float64)   # None -> nan
+        self.domains = [domain_of(c.get("link")) for c in candidates]
+        self.cluster_sizes = np.asarray([c.get("cluster_size", 1) for c in candidates], dtype=np.float64)
+
+def score_batch(batch, engagement):
+    """Vectorized weighted sum of topic affinity, recency, domain prior and coverage."""
+    n = batch.size
+    topic = np.bincount(batch.rows, weights=batch.values * engagement.topic[batch.cols], minlength=n)
+    recency = np.where(np.isnan(batch.ages), 0.5, np.exp2(-np.nan_to_num(batch.ages) / RECENCY_HALF_LIFE_HOURS))
+
+    # Few distinct outlets per batch: resolve each once, then broadcast.
+    uniq, inverse = np.unique(np.asarray(batch.domains, dtype=object).astype(str), return_inverse=True)
+    table = np.empty(len(uniq), dtype=np.float64)
+    for i, d in enumerate(uniq):
+        prior = DOMAIN_PRIORS.get(d, DEFAULT_DOMAIN_PRIOR)
+        table[i] = 0.5 * prior + 0.5 * engagement.domains[d] if d in engagement.domains else prior
+    domain = table[inverse]
+
+    coverage = np.log1p(batch.cluster_sizes - 1)
+    coverage /= max(coverage.max(), 1e-9)
+
+    score = (WEIGHTS["topic"] * topic + WEIGHTS["recency"] * recency
+             + WEIGHTS["domain"] * domain + WEIGHTS["coverage"] * coverage)
+    return score.astype(np.float32)
+
+def score_candidates(candidates, engagement=None, now=None):
+    """Scores every candidate in one batch. Returns a float32 array aligned with `candidates`."""
+    if not candidates:
+        return np.zeros(0, dtype=np.float32)
+    return score_batch(CandidateBatch(candidates, now), engagement or get_engagement_model())
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / 4)
+
+def shortlist(candidates, k=8, token_budget=1500, render=None, engagement=None):
+    """
+    Top-k candidates by local score, trimmed so their rendered prompt lines fit `token_budget`.
+    `render(candidate)` gives the line that will be sent to the LLM (defaults to title + snippet).
+    """
+    if not candidates:
+        return []
+    render = render or (lambda c: f"{c.get('title')} - {c.get('snippet')}")
+    scores = score_candidates(candidates, engagement)
+    picked, spent = [], 0
+    for i in np.argsort(-scores, kind="stable")[:k]:
+        cost = estimate_tokens(render(candidates[i]))
+        if picked and spent + cost > token_budget:
+            break
+        picked.append(candidates[i])
+        spent += cost
+    return picked
+
+def _bench(n):
+    import random
+    words = [f"term{i}" for i in range(20000)]
+    domains = list(DOMAIN_PRIORS) + ["example.com"]
+    cands = [{
+        "title": " ".join(random.choices(words, k=10)),
+        "snippet": f"{random.randint(1, 23)} hours ago ... " + " ".join(random.choices(words, k=25)),
+        "link": f"https://{random.choice(domains)}/{i}",
+        "cluster_size": random.randint(1, 4),
+    } for i in range(n)]
+    engagement = get_engagement_model()
+    t0 = time.perf_counter()
+    batch = CandidateBatch(cands)
+    t1 = time.perf_counter()
+    scores = score_batch(batch, engagement)
+    t2 = time.perf_counter()
+    print(f"🧮 Featurized {n} candidates in {(t1 - t0) * 1000:.1f} ms")
+    print(f"⚡ Scored {n} candidates in {(t2 - t1) * 1000:.1f} ms. Top: {scores.max():.3f}")
+    print(f"⏱️ Full path (featurize + score): {(t2 - t0) * 1000:.1f} ms ({n / (t2 - t0):,.0f} candidates/s); "
+          f"featurization is {(t1 - t0) / (t2 - t0):.0%} of it")
+
+if __name__ == "__main__":
+    # python -m empire.ranker 10000
+    _bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# Params that identify the caller rather than the query. They never reach the cache key.
+SECRET_PARAMS = {"key", "api_key", "access_token", "token"}
+
+# --- 1. CACHE KEYS ---
+def cache_key(namespace, params):
+    """Stable hash of (namespace, params) with secrets dropped and keys sorted."""
+    clean = {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+    blob = json.dumps([namespace, clean], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+# --- 2. THE VAULT (SQLite-backed TTL + LRU) ---
+class ResponseCache:
+    """
+    Persistent JSON response cache.
+    Each namespace (endpoint) has its own TTL; the file is held under `max_bytes`
+    by evicting least-recently-used entries. Expired entries are kept until evicted
+    so fetch() can fall back to them when the network fails.
+    """
+
+    def __init__(self, path="response_cache.db", max_bytes=50 * 1024 * 1024, ttls=None, default_ttl=3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, namespace TEXT NOT NULL, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)")
+        self.db.commit()
+
+    def ttl_for(self, namespace):
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def get(self, namespace, params, allow_stale=False):
+        """Returns the cached value, or None when absent (or expired and allow_stale is False)."""
+        key = cache_key(namespace, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT value, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if not allow_stale and now - stored_at > self.ttl_for(namespace):
+                return None
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+        return json.loads(value)
+
+    def put(self, namespace, params, value):
+        blob = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key(namespace, params), namespace, blob, len(blob), now, now),
+            )
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def fetch(self, namespace, params, fetch_fn):
+        """
+        Serves a fresh entry if there is one, otherwise calls fetch_fn() and stores the result.
+        If fetch_fn() raises and a stale entry exists, the stale entry is returned instead.
+        """
+        value = self.get(namespace, params)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+
+        self.stats["misses"] += 1
+        try:
+            value = fetch_fn()
+        except Exception as e:
+            stale = self.get(namespace, params, allow_stale=True)
+            if stale is None:
+                raise
+            self.stats["stale"] += 1
+            print(f"⚠️ Network failed ({e}). Serving stale '{namespace}' entry.")
+            return stale
+        self.put(namespace, params, value)
+        return value
+
+    def summary(self):
+        s = self.stats
+        return f"hits={s['hits']} misses={s['misses']} stale={s['stale']} evictions={s['evictions']}"
+
+    def close(self):
+        with self.lock:
+            self.db.close()
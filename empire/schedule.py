@@ -0,0 +1,77 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+# --- 1. CRON EXPRESSIONS ---
+# Five fields, as in GitHub Actions `schedule:` (UTC): minute hour day-of-month month day-of-week.
+# Each field takes *, */n, a, a-b, a-b/n and comma lists of those. Day-of-week 0 (or 7) is Sunday.
+FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(","):
+        body, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if body == "*":
+            start, end = low, high
+        elif "-" in body:
+            start, end = (int(v) for v in body.split("-", 1))
+        else:
+            start = int(body)
+            end = high if step > 1 else start
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"'{part}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class Cron:
+    """A parsed cron expression; next_after() gives the next matching minute."""
+
+    def __init__(self, expr):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got '{expr}'")
+        self.expr = expr
+        self.minute, self.hour, self.day, self.month, weekday = (
+            _parse_field(text, low, high) for text, (_, low, high) in zip(parts, FIELDS))
+        self.weekday = {d % 7 for d in weekday}
+        # As in cron: when both day fields are restricted, a day matching either one fires
+        self.day_any, self.weekday_any = parts[2] == "*", parts[4] == "*"
+
+    def _day_matches(self, dt):
+        day, weekday = dt.day in self.day, (dt.weekday() + 1) % 7 in self.weekday
+        if self.day_any or self.weekday_any:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, after):
+        """First minute strictly after `after` (an aware datetime) that matches."""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)   # e.g. "0 0 30 2 *" never fires
+        while dt < limit:
+            if dt.month not in self.month:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hour:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minute:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Cron expression '{self.expr}' never fires")
+
+    def __repr__(self):
+        return f"Cron('{self.expr}')"
+
+# --- 2. TRIGGERS ---
+class Trigger:
+    """A cron schedule plus up to `jitter_s` seconds of random delay, so runs never land on the exact minute."""
+
+    def __init__(self, expr, jitter_s=0.0, rng=None):
+        self.cron = Cron(expr)
+        self.jitter_s = jitter_s
+        self.rng = rng or random.Random()
+
+    def next_fire(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        return self.cron.next_after(now) + timedelta(seconds=self.rng.uniform(0, self.jitter_s))
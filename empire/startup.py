@@ -0,0 +1,88 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# --- 1. BUDGETS ---
+# Import time of each entry point's module body (ms, median of RUNS cold interpreters),
+# excluding what the bare interpreter already loads. Heavy SDKs belong inside the code path that needs them.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = {
+    "main.py": 900,
+    "main_empire.py": 700,
+    "telegram_bot/poster.py": 500,
+    "telegram_bot/listener.py": 1400,  # telethon + numpy are needed on every run (~870 ms measured on CI runners)
+    "daemon.py": 300,                  # engines load in warm(), not at import
+}
+BUDGET_SCALE = float(os.environ.get("STARTUP_BUDGET_SCALE", "1"))   # loosen on slow runners
+RUNS = 5
+
+# Entry points read secrets at import time; placeholders let them load without any being set.
+DUMMY_ENV = {
+    "LINKEDIN_ACCESS_TOKEN": "startup-probe",
+    "HUGGINGFACE_TOKEN": "startup-probe",
+    "GEMINI_API_KEY": "startup-probe",
+    "GOOGLE_SEARCH_API_KEY": "startup-probe",
+    "GOOGLE_CSE_ID": "startup-probe",
+    "TG_API_ID": "0",
+    "TG_API_HASH": "startup-probe",
+    "TG_SESSION_STRING": "startup-probe",
+}
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+# --- 2. THE STOPWATCH (-X importtime) ---
+def _importtime(code):
+    """Runs `code` in a fresh interpreter. Returns {top-level module: cumulative us}."""
+    env = dict(os.environ)
+    for name, value in DUMMY_ENV.items():
+        env.setdefault(name, value)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)   # any non-empty value (even "0") disables .pyc writes; measure warm imports
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        errors = [l for l in (proc.stderr + proc.stdout).splitlines() if l.strip() and not l.startswith("import time:")]
+        raise RuntimeError(errors[-1] if errors else f"exit {proc.returncode}")
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m and len(m.group(3)) == 1:   # one space of indent = imported directly, not as a dependency
+            modules[m.group(4)] = modules.get(m.group(4), 0) + int(m.group(2))
+    return modules
+
+def measure(path, runs=RUNS):
+    """Returns (median ms, heaviest [(module, ms)]) for loading `path` without running its __main__ block."""
+    baseline = set(_importtime("import runpy"))   # the interpreter plus the probe itself
+    code = f"import runpy, sys; sys.path.insert(0, {ROOT!r}); runpy.run_path({path!r}, run_name='startup_probe')"
+    totals, heaviest = [], {}
+    for _ in range(runs):
+        modules = {k: v for k, v in _importtime(code).items() if k not in baseline}
+        totals.append(sum(modules.values()) / 1000)
+        for name, us in modules.items():
+            heaviest[name] = max(heaviest.get(name, 0), us / 1000)
+    top = sorted(heaviest.items(), key=lambda kv: -kv[1])[:5]
+    return statistics.median(totals), top
+
+def check(entry_points=None, scale=BUDGET_SCALE, runs=RUNS):
+    """Measures every entry point against its budget. Returns True if all are within budget."""
+    ok = True
+    for path, budget in (entry_points or ENTRY_POINTS).items():
+        budget *= scale
+        try:
+            ms, top = measure(path, runs)
+        except RuntimeError as e:
+            print(f"❌ {path}: failed to import ({e})")
+            ok = False
+            continue
+        within = ms <= budget
+        ok = ok and within
+        print(f"{'✅' if within else '❌'} {path}: {ms:.0f} ms imports (budget {budget:.0f} ms)")
+        for name, module_ms in top:
+            print(f"      {module_ms:7.1f} ms  {name}")
+    return ok
+
+if __name__ == "__main__":
+    # python -m empire.startup [entry.py ...]
+    selected = {p: ENTRY_POINTS.get(p, min(ENTRY_POINTS.values())) for p in sys.argv[1:]} or None
+    sys.exit(0 if check(selected) else 1)
@@ -0,0 +1,202 @@
+import atexit
+import contextvars
+import json
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+
+# --- 1. CONFIGURATION ---
+# Tracing is off unless TELEMETRY_FILE is set; then spans, events and counters are appended to it as JSONL.
+TELEMETRY_FILE = os.environ.get("TELEMETRY_FILE", "")
+ENABLED = bool(TELEMETRY_FILE)
+FLUSH_EVERY = 500   # buffered records before a write
+
+_run_id = uuid.uuid4().hex[:12]
+_run_started = time.time()
+_current = contextvars.ContextVar("telemetry_span", default=None)
+_lock = threading.Lock()
+_buffer = []
+_counters = {}
+
+def _emit(record):
+    record["run"] = _run_id
+    with _lock:
+        _buffer.append(record)
+        full = len(_buffer) >= FLUSH_EVERY
+    if full:
+        _write()
+
+def _write(extra=()):
+    with _lock:
+        records, _buffer[:] = list(_buffer) + list(extra), []
+    if records and TELEMETRY_FILE:
+        with open(TELEMETRY_FILE, "a") as f:
+            f.write("".join(json.dumps(r, default=str) + "\n" for r in records))   # one append per flush
+
+# --- 2. SPANS ---
+class Span:
+    """A timed section. Nested spans (across threads started with copy_context, and asyncio tasks) record their parent."""
+
+    __slots__ = ("name", "attrs", "id", "parent", "start", "_t0", "_token")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.id = uuid.uuid4().hex[:8]
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self._token = _current.set(self.id)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._t0
+        _current.reset(self._token)
+        status = "ok"
+        if exc_type is not None and not (exc_type is SystemExit and exc.code in (0, None)):
+            status = "error"
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"[:300]
+        _emit({"type": "span", "name": self.name, "id": self.id, "parent": self.parent, "start": round(self.start, 4),
+               "duration_ms": round(duration * 1000, 3), "status": status, "attrs": self.attrs})
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP = _NoopSpan()
+
+def span(name, **attrs):
+    """`with span("news.search", topic=t) as s: ...`. A shared no-op object when tracing is off."""
+    if not ENABLED:
+        return _NOOP
+    return Span(name, attrs)
+
+# --- 3. COUNTERS & EVENTS ---
+def count(name, amount=1, **labels):
+    """Adds `amount` to a counter, e.g. count("llm.prompt_tokens", 812, model="gemini-1.5-flash")."""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def event(name, **attrs):
+    """A point-in-time record (a post published, a channel skipped) under the current span."""
+    if not ENABLED:
+        return
+    _emit({"type": "event", "name": name, "parent": _current.get(), "time": round(time.time(), 4), "attrs": attrs})
+
+def count_response(response, *args, **kwargs):
+    """requests response hook: calls, bytes and error statuses per host. Streamed bodies count their Content-Length."""
+    host = response.url.split("/", 3)[2] if "://" in response.url else response.url
+    body = response.request.body
+    sent = len(body) if isinstance(body, (bytes, str)) else int(response.request.headers.get("Content-Length") or 0)
+    count("http.calls", host=host)
+    count("http.bytes_out", sent, host=host)
+    count("http.bytes_in", int(response.headers.get("Content-Length") or 0), host=host)
+    if response.status_code >= 400:
+        count("http.errors", host=host, status=response.status_code)
+    return response
+
+def flush():
+    """Writes buffered spans plus this process's counters and run record. Registered at exit."""
+    if not ENABLED:
+        return
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in _counters.items()]
+        _counters.clear()
+    run = {"type": "run", "run": _run_id, "entry": os.path.basename(sys.argv[0] or "python"), "argv": sys.argv[1:],
+           "start": round(_run_started, 4), "duration_ms": round((time.time() - _run_started) * 1000, 3)}
+    _write([{"type": "counters", "run": _run_id, "counters": counters}, run] if counters else [run])
+
+if ENABLED:
+    atexit.register(flush)
+
+# --- 4. THE REPORT (Aggregate Runs) ---
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)] if ordered else 0.0
+
+def load(paths):
+    records = []
+    for path in paths:
+        with open(path) as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+def summarize(records):
+    """{"runs": {entry: n}, "spans": {name: stats}, "counters": {name: total}, "per_post": {name: total / posts}}."""
+    runs, spans, counters = {}, {}, {}
+    for r in records:
+        if r["type"] == "run":
+            runs[r["entry"]] = runs.get(r["entry"], 0) + 1
+        elif r["type"] == "span":
+            row = spans.setdefault(r["name"], {"durations": [], "errors": 0})
+            row["durations"].append(r["duration_ms"])
+            row["errors"] += r["status"] == "error"
+        elif r["type"] == "counters":
+            for c in r["counters"]:
+                counters[c["name"]] = counters.get(c["name"], 0) + c["value"]
+    span_stats = {
+        name: {"n": len(row["durations"]), "errors": row["errors"], "p50_ms": round(_percentile(row["durations"], 50), 1),
+               "p95_ms": round(_percentile(row["durations"], 95), 1), "total_ms": round(sum(row["durations"]), 1)}
+        for name, row in spans.items()
+    }
+    posts = counters.get("posts.published", 0)
+    per_post = {name: round(value / posts, 1) for name, value in counters.items() if posts and name != "posts.published"}
+    return {"runs": runs, "spans": span_stats, "counters": counters, "per_post": per_post}
+
+def print_report(summary):
+    print(f"📈 {sum(summary['runs'].values())} runs: " + ", ".join(f"{k} ×{v}" for k, v in sorted(summary["runs"].items())))
+    print(f"\n   {'span':<28} {'n':>5} {'err':>4} {'p50 ms':>10} {'p95 ms':>10} {'total s':>9}")
+    for name, row in sorted(summary["spans"].items(), key=lambda kv: -kv[1]["total_ms"]):
+        print(f"   {name:<28} {row['n']:>5} {row['errors']:>4} {row['p50_ms']:>10.1f} {row['p95_ms']:>10.1f} {row['total_ms'] / 1000:>9.2f}")
+    print(f"\n   {'counter':<28} {'total':>14} {'per post':>12}")
+    for name, value in sorted(summary["counters"].items()):
+        per_post = summary["per_post"].get(name)
+        print(f"   {name:<28} {value:>14,} {per_post if per_post is not None else '':>12}")
+
+def _bench(n):
+    """Cost of one span + one counter per iteration, disabled vs enabled."""
+    global ENABLED
+    was = ENABLED
+    for enabled in (False, True):
+        ENABLED = enabled
+        started = time.perf_counter()
+        for _ in range(n):
+            with span("bench"):
+                count("bench.calls")
+        elapsed = time.perf_counter() - started
+        print(f"⏱️ tracing {'on ' if enabled else 'off'}: {elapsed / n * 1e9:,.0f} ns per span+counter")
+    ENABLED = was
+    with _lock:
+        _buffer.clear()
+        _counters.clear()
+
+if __name__ == "__main__":
+    # python -m empire.telemetry report [telemetry.jsonl ...] | python -m empire.telemetry bench [n]
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("report", [])
+    if command == "bench":
+        _bench(int(args[0]) if args else 200_000)
+    else:
+        paths = [p for p in args or [TELEMETRY_FILE or "telemetry.jsonl"] if os.path.exists(p)]
+        if not paths:
+            sys.exit("⚠️ No telemetry recorded (set TELEMETRY_FILE to trace a run).")
+        print_report(summarize(load(paths)))
@@ -1,15 +1,21 @@
-import requests
+import atexit
 import os
 import sys
 import json
 import random
-import time
-from google import genai
-from google.genai import types
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from empire.net import get_session, TokenBucket
+from empire.history import HistoryStore
+from empire.response_cache import ResponseCache
+from empire.llm import get_gateway, GEMINI_API_KEY
+from empire.accounts import accounts_configured, load_accounts, Shared
+from empire.pipeline import Pipeline
+from empire.media import open_image_stream, ImageStream, MediaRejected, KEEP_MEDIA_FILES
+from empire.linkedin import get_publisher, LinkedInError, AlreadyPublished
+from empire.imaging import optimize_image, describe, IMAGE_PROFILE
 
 # --- 1. EMPIRE CONFIGURATION ---
 LINKEDIN_TOKEN = os.environ.get("LINKEDIN_ACCESS_TOKEN")
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 GOOGLE_SEARCH_API_KEY = os.environ.get("GOOGLE_SEARCH_API_KEY")
 GOOGLE_CSE_ID = os.environ.get("GOOGLE_CSE_ID")
 
@@ -44,84 +50,157 @@ SEARCH_TOPICS = [
     "room temperature superconductor replication attempts"
 ]
 
-HISTORY_FILE = "posted_history.txt"
+HISTORY_FILE = "posted_history.txt"   # legacy flat file, imported once into HISTORY_DB
+HISTORY_DB = os.environ.get("HISTORY_DB", "posted_history.db")
+HISTORY_TTL_DAYS = float(os.environ.get("HISTORY_TTL_DAYS", "365"))
 
-if not all([LINKEDIN_TOKEN, GEMINI_API_KEY, GOOGLE_SEARCH_API_KEY, GOOGLE_CSE_ID]):
+# --- SEARCH FAN-OUT ---
+CSE_ENDPOINT = os.environ.get("CSE_ENDPOINT", "https://www.googleapis.com/customsearch/v1")
+SEARCH_TOPIC_COUNT = os.environ.get("SEARCH_TOPIC_COUNT", "2")     # integer, or "all" to sweep every topic
+SEARCH_PAGES = int(os.environ.get("SEARCH_PAGES", "1"))            # pages per topic
+SEARCH_RESULTS_PER_PAGE = min(int(os.environ.get("SEARCH_RESULTS_PER_PAGE", "3")), 10)  # CSE caps num at 10
+SEARCH_WORKERS = int(os.environ.get("SEARCH_WORKERS", "8"))
+SEARCH_QPS = float(os.environ.get("SEARCH_QPS", "10"))             # client-side rate limit (0 = off)
+SEARCH_BURST = float(os.environ.get("SEARCH_BURST", "20"))
+
+search_limiter = TokenBucket(SEARCH_QPS, capacity=SEARCH_BURST)
+
+# --- RESPONSE CACHE ---
+RESPONSE_CACHE_DB = os.environ.get("RESPONSE_CACHE_DB", "response_cache.db")
+RESPONSE_CACHE_MAX_MB = float(os.environ.get("RESPONSE_CACHE_MAX_MB", "50"))
+CACHE_TTLS = {
+    "cse_web": float(os.environ.get("CACHE_TTL_CSE_WEB", str(3 * 3600))),       # news moves within the d1 window
+    "cse_image": float(os.environ.get("CACHE_TTL_CSE_IMAGE", str(7 * 86400))),  # wallpapers barely change
+}
+
+# --- EDITOR SHORTLIST ---
+EDITOR_SHORTLIST_K = int(os.environ.get("EDITOR_SHORTLIST_K", "8"))
+EDITOR_TOKEN_BUDGET = int(os.environ.get("EDITOR_TOKEN_BUDGET", "1500"))   # tokens spent on the story list
+
+if not all([LINKEDIN_TOKEN or accounts_configured(), GEMINI_API_KEY, GOOGLE_SEARCH_API_KEY, GOOGLE_CSE_ID]):
     print("❌ CRITICAL: Missing one or more API Keys. System Halting.")
     sys.exit(1)
 
 # --- 2. THE ARCHIVIST (Memory) ---
-def load_history():
-    if not os.path.exists(HISTORY_FILE): return []
-    with open(HISTORY_FILE, "r") as f:
-        return [line.strip() for line in f.readlines()]
+_histories = {}
+
+def load_history(account=None):
+    """
+    Opens an account's posted-link store once per process (the default store without an account).
+    `link in history` is an indexed lookup.
+    """
+    key = account.namespace if account else None
+    if key not in _histories:
+        path = account.path(HISTORY_DB) if account else HISTORY_DB
+        _histories[key] = HistoryStore(path, ttl_days=HISTORY_TTL_DAYS, legacy_file=HISTORY_FILE if key is None else None)
+        atexit.register(_histories[key].close)   # writes the Bloom filter once, not on every post
+    return _histories[key]
 
-def save_to_history(link):
-    with open(HISTORY_FILE, "a") as f:
-        f.write(f"{link}\n")
+def save_to_history(link, account=None):
+    history = load_history(account)
+    history.add(link)
+    history.compact()
 
 # --- 3. THE HUNTER (Google Web Search) ---
-def search_the_web_for_news():
+def pick_search_topics():
+    if SEARCH_TOPIC_COUNT.lower() == "all":
+        return list(SEARCH_TOPICS)
+    return random.sample(SEARCH_TOPICS, min(int(SEARCH_TOPIC_COUNT), len(SEARCH_TOPICS)))
+
+_response_cache = None
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(RESPONSE_CACHE_DB, max_bytes=int(RESPONSE_CACHE_MAX_MB * 1024 * 1024), ttls=CACHE_TTLS)
+    return _response_cache
+
+def cse_get(namespace, params):
+    """
+    CSE GET through the response cache. Only real network calls count against the rate limit;
+    on network failure a stale cached answer is served if one exists.
+    """
+    def fetch():
+        search_limiter.acquire()
+        resp = get_session().get(CSE_ENDPOINT, params=params, timeout=15)
+        resp.raise_for_status()
+        return resp.json()
+    return get_response_cache().fetch(namespace, params, fetch)
+
+def search_one_page(query, page):
+    """Fetches a single page of CSE results for `query` (page is 0-based)."""
+    params = {
+        "q": query,
+        "cx": GOOGLE_CSE_ID,
+        "key": GOOGLE_SEARCH_API_KEY,
+        "num": SEARCH_RESULTS_PER_PAGE,
+        "start": 1 + page * SEARCH_RESULTS_PER_PAGE,
+        "dateRestrict": "d1", # Only last 24 hours
+        "safe": "active"
+    }
+    return cse_get("cse_web", params).get("items", [])
+
+def search_the_web_for_news(topics=None, pages=None, history=None):
     """
     Uses Google Custom Search API to find high-signal news from the last 24 hours.
+    Every (topic, page) request runs concurrently on the pooled session, throttled by `search_limiter`.
+    Links already in `history` (default: the posted-link store) are dropped.
     """
     print("📡 Satellites aligning. Scanning the entire web for fresh signals...")
     
     candidates = []
-    history = load_history()
+    history = load_history() if history is None else history
+    topics = topics if topics is not None else pick_search_topics()
+    pages = pages if pages is not None else SEARCH_PAGES
+    jobs = [(query, page) for query in topics for page in range(pages)]
+    seen_links = set()
     
-    # Pick 2 random topics to search
-    daily_topics = random.sample(SEARCH_TOPICS, 2)
-    
-    for query in daily_topics:
-        try:
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                "q": query,
-                "cx": GOOGLE_CSE_ID,
-                "key": GOOGLE_SEARCH_API_KEY,
-                "num": 3,             
-                "dateRestrict": "d1", # Only last 24 hours
-                "safe": "active"
-            }
-            
-            resp = requests.get(url, params=params)
-            data = resp.json()
-            
-            if "items" in data:
-                for item in data["items"]:
-                    title = item.get("title")
-                    link = item.get("link")
-                    snippet = item.get("snippet")
-                    
-                    if link not in history:
-                        candidates.append({
-                            "title": title,
-                            "link": link,
-                            "snippet": snippet,
-                            "source": "Google Search"
-                        })
-            time.sleep(1) # Be nice to Google Search API
-                        
-        except Exception as e:
-            print(f"⚠️ Search Glitch on '{query}': {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=max(1, min(SEARCH_WORKERS, len(jobs)))) as pool:
+        futures = {pool.submit(search_one_page, query, page): query for query, page in jobs}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                items = future.result()
+            except Exception as e:
+                print(f"⚠️ Search Glitch on '{query}': {e}")
+                continue
 
+            for item in items:
+                link = item.get("link")
+                if not link or link in seen_links or link in history:
+                    continue
+                seen_links.add(link)
+                metatags = (item.get("pagemap", {}).get("metatags") or [{}])[0]
+                candidates.append({
+                    "title": item.get("title"),
+                    "link": link,
+                    "snippet": item.get("snippet"),
+                    "published": metatags.get("article:published_time"),
+                    "source": "Google Search"
+                })
+
+    print(f"📡 {len(jobs)} searches across {len(topics)} topics returned {len(candidates)} fresh candidates.")
+    print(f"🗄️ Search cache: {get_response_cache().summary()}")
     return candidates
 
 # --- 4. THE EDITOR-IN-CHIEF (Gemini Selection) ---
-def select_viral_story(client, candidates):
+def render_candidate(c):
+    return f"{c['title']} - {c['snippet']} (Link: {c['link']})"
+
+def select_viral_story(llm, candidates):
     """
-    Feeds all search results to Gemini to pick the potential viral hit.
+    Shortlists candidates locally, then feeds only the shortlist to Gemini to pick the potential viral hit.
     """
     if not candidates: return None
 
-    print(f"🧠 AI Analyzing {len(candidates)} raw intelligence reports...")
+    from empire.ranker import shortlist   # numpy is imported off the startup path
+    candidates = shortlist(candidates, k=EDITOR_SHORTLIST_K, token_budget=EDITOR_TOKEN_BUDGET, render=render_candidate)
+    print(f"🧠 AI Analyzing {len(candidates)} shortlisted intelligence reports...")
     
     # Prepare data for AI
     candidate_list = []
     for i, c in enumerate(candidates):
-        candidate_list.append(f"ID {i}: {c['title']} - {c['snippet']} (Link: {c['link']})")
+        candidate_list.append(f"ID {i}: {render_candidate(c)}")
     
     prompt = f"""
     You are the Editor-in-Chief of a world-class Tech publication.
@@ -139,14 +218,8 @@ def select_viral_story(client, candidates):
     """
     
     try:
-        response = client.models.generate_content(
-            model='gemini-1.5-flash', # Stable, High Quota Model
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json"
-            )
-        )
-        result = json.loads(response.text)
+        text = llm.generate(prompt, model='gemini-1.5-flash', json_output=True) # Stable, High Quota Model
+        result = json.loads(text)
         winner = candidates[result['id']]
         print(f"🌟 WINNER SELECTED: {winner['title']}")
         print(f"🤔 Strategy: {result['reason']}")
@@ -156,10 +229,9 @@ def select_viral_story(client, candidates):
         return candidates[0]
 
 # --- 5. THE GHOSTWRITER (Gemini Content Gen) ---
-def write_empire_post(client, article):
-    print("⏳ Cooling down AI engines (5s)...")
-    time.sleep(5) 
-
+def write_empire_post(llm, article, note=""):
+    # Pacing is handled by the gateway's per-model rate limiter; no fixed cool-down needed.
+    # `note`: an account's profile line in multi-account runs (Account.prompt_note).
     prompt = f"""
     SOURCE MATERIAL:
     Title: {article['title']}
@@ -182,25 +254,25 @@ def write_empire_post(client, article):
     - Tone: Confident, crisp, authoritative.
     - END with 3 relevant hashtags.
     - Do NOT start with "In the rapidly evolving landscape..."
-    """
+    """ + note
     
     try:
-        response = client.models.generate_content(
-            model='gemini-1.5-flash', # Keeping 1.5-flash for reliability
-            contents=prompt
-        )
-        return response.text.strip()
+        text = llm.generate(prompt, model='gemini-1.5-flash') # Keeping 1.5-flash for reliability
+        return text.strip()
     except Exception as e:
         print(f"❌ Writing Error: {e}")
         return None
 
 # --- 6. THE ART DIRECTOR (Google Image Search) ---
 def find_perfect_image(query_term):
+    """
+    Returns optimized image bytes for the best match (a raw ImageStream with IMAGE_PROFILE=off,
+    or a file path with KEEP_MEDIA_FILES=1).
+    """
     print(f"🎨 Commissioning art for: '{query_term}'...")
     image_path = "viral_visual.jpg"
     
     try:
-        url = "https://www.googleapis.com/customsearch/v1"
         params = {
             "q": query_term + " technology wallpaper", 
             "cx": GOOGLE_CSE_ID,
@@ -212,117 +284,205 @@ def find_perfect_image(query_term):
             "safe": "active"
         }
         
-        resp = requests.get(url, params=params)
-        data = resp.json()
+        data = cse_get("cse_image", params)
         
         if "items" in data:
             img_url = data["items"][0]["link"]
             print(f"🖼️ Image Found: {img_url}")
-            img_data = requests.get(img_url, timeout=10).content
-            with open(image_path, 'wb') as f:
-                f.write(img_data)
-            return image_path
+            stream = open_image_stream(img_url)
+            if IMAGE_PROFILE == "off":
+                # The validated stream is piped straight into the LinkedIn PUT; a local copy is opt-in.
+                return stream.save(image_path) if KEEP_MEDIA_FILES else stream
+
+            data, report = optimize_image(stream.read_all())
+            print(describe(report))
+            if KEEP_MEDIA_FILES:
+                with open(image_path, "wb") as f:
+                    f.write(data)
+                return image_path
+            return data
             
     except Exception as e:
         print(f"⚠️ Image Search Failed: {e}")
     
     return None
 
-# --- 7. THE PUBLISHER (LinkedIn API) ---
-def get_urn():
-    url = "https://api.linkedin.com/v2/userinfo"
-    headers = {"Authorization": f"Bearer {LINKEDIN_TOKEN}"}
-    resp = requests.get(url, headers=headers)
-    if resp.status_code != 200:
-        print(f"❌ LinkedIn Auth Error: {resp.text}")
+# --- 7. THE PUBLISHER (LinkedIn API, see empire/linkedin.py) ---
+def get_urn(publisher=None):
+    try:
+        return (publisher or get_publisher()).get_urn()
+    except LinkedInError as e:
+        print(f"❌ LinkedIn Auth Error: {e}")
         sys.exit(1)
-    return f"urn:li:person:{resp.json()['sub']}"
-
-def upload_image(urn, image_path):
-    reg_url = "https://api.linkedin.com/v2/assets?action=registerUpload"
-    headers = {"Authorization": f"Bearer {LINKEDIN_TOKEN}", "Content-Type": "application/json"}
-    payload = {
-        "registerUploadRequest": {
-            "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-            "owner": urn,
-            "serviceRelationships": [{"relationshipType": "OWNER", "identifier": "urn:li:userGeneratedContent"}]
-        }
-    }
-    
+
+def register_upload(urn, image, publisher=None):
+    """Registers a LinkedIn image asset. Returns (upload_url, asset_urn), or None on failure or with no image to upload."""
+    if not image:
+        return None
     try:
-        reg_resp = requests.post(reg_url, headers=headers, json=payload)
-        reg = reg_resp.json()
-        upload_url = reg['value']['uploadMechanism']['com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
-        asset = reg['value']['asset']
-        
-        with open(image_path, "rb") as f:
-            requests.put(upload_url, headers={"Authorization": f"Bearer {LINKEDIN_TOKEN}"}, data=f.read())
-            
-        return asset
-    except Exception as e:
-        print(f"❌ Image Upload Failed: {e}")
+        return (publisher or get_publisher()).register_upload(urn)
+    except (LinkedInError, KeyError) as e:
+        print(f"❌ Asset Registration Failed: {e}")
         return None
 
-def post_to_linkedin(urn, text, image_asset=None):
-    url = "https://api.linkedin.com/v2/ugcPosts"
-    headers = {"Authorization": f"Bearer {LINKEDIN_TOKEN}", "Content-Type": "application/json", "X-Restli-Protocol-Version": "2.0.0"}
-    
-    share_content = {"shareCommentary": {"text": text}, "shareMediaCategory": "NONE"}
-    if image_asset:
-        share_content["shareMediaCategory"] = "IMAGE"
-        share_content["media"] = [{"status": "READY", "description": {"text": "Image"}, "media": image_asset, "title": {"text": "Visual"}}]
-
-    payload = {
-        "author": urn,
-        "lifecycleState": "PUBLISHED",
-        "specificContent": {"com.linkedin.ugc.ShareContent": share_content},
-        "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
-    }
-    
-    resp = requests.post(url, headers=headers, json=payload)
-    if resp.status_code == 201:
-        print("✅ POST LIVE ON LINKEDIN.")
-        return True
-    print(f"❌ Publish Failed: {resp.text}")
-    return False
+def put_image(registration, image, publisher=None):
+    """Uploads bytes, an ImageStream or a file path to a registered asset. Returns the asset URN, or None on failure."""
+    if not registration or not image:
+        return None
+    try:
+        return (publisher or get_publisher()).upload(registration, image)
+    except (LinkedInError, OSError, MediaRejected) as e:   # MediaRejected: a streamed image over the limits mid-upload
+        print(f"❌ Image Upload Failed: {e}")
+        return None
 
-# --- MAIN EXECUTION ---
-if __name__ == "__main__":
-    print("🚀 EMPIRE ENGINE STARTING...")
-    
-    # 0. Initialize New Gemini Client
+def post_to_linkedin(urn, text, image_asset=None, publisher=None):
+    """True once posted, False on failure, None when the ledger shows this post already went out."""
     try:
-        client = genai.Client(api_key=GEMINI_API_KEY)
-    except Exception as e:
-        print(f"❌ Gemini Client Error: {e}")
-        sys.exit(1)
+        (publisher or get_publisher()).publish(urn, text, image_asset)
+    except AlreadyPublished as e:
+        print(f"↩️ {e}")
+        return None
+    except LinkedInError as e:
+        print(f"❌ Publish Failed: {e}")
+        return False
+    print("✅ POST LIVE ON LINKEDIN.")
+    return True
 
-    # 1. Get User
-    urn = get_urn()
+# --- 8. THE FLIGHT PLAN (Stage Graph) ---
+def open_gateway():
+    """The shared gateway. The Gemini SDK (~1.4s to import) loads on the first call that misses the cache."""
+    return get_gateway()
 
-    # 2. Search Web (Last 24h)
-    candidates = search_the_web_for_news()
+def gather_candidates(history=None):
+    candidates = search_the_web_for_news(history=history)
     if not candidates:
         print("⚠️ No fresh news found. Sleeping.")
         sys.exit(0)
+    return candidates
 
-    # 3. Select Best
-    story = select_viral_story(client, candidates)
+def collapse_stories(search):
+    """Collapses the same story reported by several outlets."""
+    from empire.clustering import cluster_candidates
+    stories = cluster_candidates(search)
+    print(f"🧬 Clustered {len(search)} candidates into {len(stories)} distinct stories.")
+    return stories
 
-    # 4. Write Copy
-    copy = write_empire_post(client, story)
-    
+def write_copy(llm, select, note=""):
+    copy = write_empire_post(llm, select, note)
     if not copy:
         print("❌ AI failed to write copy. Exiting.")
         sys.exit(1)
-        
     print("\n--- FINAL COPY ---\n" + copy + "\n------------------\n")
+    return copy
 
-    # 5. Get Image
-    img_path = find_perfect_image(story['title'])
+def publish(urn, select, write, upload, image):
+    if post_to_linkedin(urn, write, upload):
+        save_to_history(select['link'])
+        if isinstance(image, str) and os.path.exists(image): os.remove(image)
+        return True
+    return False
+
+def build_news_pipeline():
+    """
+    urn ──────────────────────────────┐
+    search → cluster → select → image ┴► register → upload ─┐
+                              └──► write ───────────────────┴► publish
+    Image search, asset registration and the upload overlap with copywriting; no image, no registration.
+    """
+    flow = Pipeline("news")
+    flow.add("llm", open_gateway)
+    flow.add("urn", get_urn)
+    flow.add("search", gather_candidates)
+    flow.add("cluster", collapse_stories, deps=["search"])
+    flow.add("select", lambda llm, cluster: select_viral_story(llm, cluster), deps=["llm", "cluster"])
+    flow.add("write", write_copy, deps=["llm", "select"])
+    flow.add("image", lambda select: find_perfect_image(select['title']), deps=["select"])
+    flow.add("register", register_upload, deps=["urn", "image"])
+    flow.add("upload", lambda register, image: put_image(register, image), deps=["register", "image"])
+    flow.add("publish", publish, deps=["urn", "select", "write", "upload", "image"])
+    return flow
 
-    # 6. Publish
-    asset = upload_image(urn, img_path) if img_path else None
-    if post_to_linkedin(urn, copy, asset):
-        save_to_history(story['link'])
-        if img_path and os.path.exists(img_path): os.remove(img_path)
+# --- 9. THE FAN-OUT (Several Accounts, One Search) ---
+def shared_image(query_term):
+    """find_perfect_image() as bytes, so one download can be uploaded by every account."""
+    image = find_perfect_image(query_term)
+    if isinstance(image, ImageStream):
+        return image.read_all()
+    if isinstance(image, str):
+        with open(image, "rb") as f:
+            return f.read()
+    return image
+
+def pick_for_account(account, llm, stories, shared):
+    """The editor's pick among stories this account has not posted. Accounts with the same fresh set share one call."""
+    history = load_history(account)
+    fresh = [s for s in stories if s['link'] not in history]
+    if not fresh:
+        print(f"💤 [{account.name}] Every story was already posted.")
+        sys.exit(0)
+    return shared.get(("select",) + tuple(s['link'] for s in fresh), lambda: select_viral_story(llm, fresh))
+
+def publish_for(account, urn, select, write, upload):
+    if post_to_linkedin(urn, write, upload, account.publisher):
+        save_to_history(select['link'], account)
+        return True
+    return False
+
+def build_account_pipeline(account, llm, stories, shared):
+    """
+    One account's half of the fan-out: its own history filter, copy, identity, upload and post.
+    The pick and the image are shared by every account that lands on the same story.
+    """
+    publisher = account.publisher
+    flow = Pipeline(f"news:{account.name}")
+    flow.add("urn", lambda: get_urn(publisher))
+    flow.add("select", lambda: pick_for_account(account, llm, stories, shared))
+    flow.add("write", lambda select: write_copy(llm, select, account.prompt_note), deps=["select"])
+    flow.add("image", lambda select: shared.get(("image", select['link']), lambda: shared_image(select['title'])), deps=["select"])
+    flow.add("register", lambda urn, image: register_upload(urn, image, publisher), deps=["urn", "image"])
+    flow.add("upload", lambda register, image: put_image(register, image, publisher), deps=["register", "image"])
+    flow.add("publish", lambda urn, select, write, upload: publish_for(account, urn, select, write, upload),
+             deps=["urn", "select", "write", "upload"])
+    return flow
+
+def run_account(account, llm, stories, shared):
+    """Runs one account's pipeline; a failure (or nothing to post) ends that account only. Returns True if it posted."""
+    try:
+        return bool(build_account_pipeline(account, llm, stories, shared).run(report=False).results.get("publish"))
+    except SystemExit as e:
+        if e.code not in (0, None):
+            print(f"❌ [{account.name}] Stopped: {e.code}")
+    except Exception as e:
+        print(f"❌ [{account.name}] {type(e).__name__}: {e}")
+    return False
+
+def build_fanout_pipeline(accounts):
+    """
+    search → cluster ─┬► post:A (select → write/image → upload → publish)
+    llm ──────────────┼► post:B ...
+                      └► ...
+    Search, clustering, the editor's pick and the image run once, however many accounts there are;
+    each account writes its own copy.
+    """
+    shared = Shared()
+    flow = Pipeline("news-fanout")
+    flow.add("llm", open_gateway)
+    flow.add("search", lambda: gather_candidates(history=()))   # each account filters by its own history
+    flow.add("cluster", collapse_stories, deps=["search"])
+    for account in accounts:
+        flow.add(f"post:{account.name}", lambda llm, cluster, account=account: run_account(account, llm, cluster, shared),
+                 deps=["llm", "cluster"])
+    return flow
+
+# --- MAIN EXECUTION ---
+if __name__ == "__main__":
+    print("🚀 EMPIRE ENGINE STARTING...")
+    if "--accounts" in sys.argv:
+        # python main.py --accounts : one search, one post per account in accounts.json
+        accounts = load_accounts("news")
+        if not accounts:
+            sys.exit("❌ No account in accounts.json runs the news engine.")
+        run = build_fanout_pipeline(accounts).run(max_workers=len(accounts) + 2)
+        print(f"📣 Posted to {sum(bool(run.results.get(f'post:{a.name}')) for a in accounts)}/{len(accounts)} accounts.")
+    else:
+        build_news_pipeline().run()
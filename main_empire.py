@@ -1,23 +1,20 @@
-import requests
 import os
 import random
 import sys
-import time
-import re
-import yfinance as yf
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import pandas as pd
-from datetime import datetime
-from huggingface_hub import InferenceClient
-import google.generativeai as genai # <--- NEW IMPORT
+from empire.llm import get_gateway, GEMINI_API_KEY
+from empire.pipeline import Pipeline
+from empire.media import KEEP_MEDIA_FILES
+from empire.linkedin import get_publisher, LinkedInError, AlreadyPublished
+from empire.imaging import optimize_image, describe
+from empire.accounts import accounts_configured, load_accounts
+# The chart stack (numpy, matplotlib, market data, quant) and the art pool are imported inside
+# the functions that use them, so TECH/MINDSET runs never load matplotlib.
 
 # --- 0. ARCHITECT CONFIGURATION ---
-LINKEDIN_TOKEN = os.environ["LINKEDIN_ACCESS_TOKEN"]
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+LINKEDIN_TOKEN = os.environ.get("LINKEDIN_ACCESS_TOKEN")
 HF_TOKEN = os.environ["HUGGINGFACE_TOKEN"]
 
-if not LINKEDIN_TOKEN or not GEMINI_API_KEY or not HF_TOKEN:
+if not (LINKEDIN_TOKEN or accounts_configured()) or not GEMINI_API_KEY or not HF_TOKEN:
     print("❌ CRITICAL: Missing API Keys. System Shutting Down.")
     sys.exit(1)
 
@@ -29,66 +26,144 @@ def clean_ai_slop(text):
         text = text.replace(word.capitalize(), "")
     return text.strip()
 
+def keep_copy(data, path):
+    """Writes a debugging copy of an in-memory asset when KEEP_MEDIA_FILES=1."""
+    if KEEP_MEDIA_FILES:
+        with open(path, "wb") as f:
+            f.write(data)
+    return data
+
 # --- 2. THE QUANT QUANT (Charts) ---
+FINANCE_UNIVERSE = ["NVDA", "MSTR", "COIN", "TSLA", "AMD", "ETH-USD", "SOL-USD"]
+CHART_DAYS = 22   # ~1 month of trading days
+ANALYTICS_DAYS = 60
+CHART_DIR = os.environ.get("CHART_DIR", "charts")   # where --charts writes the rendered universe
+
+_market = None
+
+def get_market_store():
+    global _market
+    if _market is None:
+        from empire.market_data import MarketDataStore
+        _market = MarketDataStore()
+    return _market
+
 def generate_pro_chart(ticker):
     print(f"📉 Quant Engine: Analyzing {ticker}...")
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period="1mo", interval="1d")
-        if df.empty: return None
-
-        df['SMA_5'] = df['Close'].rolling(window=5).mean()
-
-        plt.style.use('dark_background')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        ax.plot(df.index, df['Close'], label='Price', color='#00ff41', linewidth=2) 
-        ax.plot(df.index, df['SMA_5'], label='Trend', color='#ff00ff', linestyle='--', linewidth=1.5) 
-
-        ax.set_title(f"${ticker} | MARKET VELOCITY", color='white', fontsize=14, fontweight='bold', pad=20)
-        ax.grid(True, color='#333333', linestyle='--', alpha=0.5)
-        ax.legend(loc='upper left', frameon=False)
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-        plt.xticks(rotation=45)
-        
-        chart_path = "assets_chart.png"
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='black')
-        plt.close()
+        store = get_market_store()
+        if ticker not in store.synced:
+            store.sync([ticker])   # only bars missing since the last run are downloaded
+        dates, closes = store.closes(ticker, CHART_DAYS)
+        if len(closes) == 0: return None
+
+        from empire.charts import render_chart
+        png = render_chart(ticker, dates, closes)
         print("✅ Chart Rendered.")
-        return chart_path
+        return keep_copy(png, "assets_chart.png")
     except Exception as e:
         print(f"⚠️ Chart Failed: {e}")
         return None
 
+def generate_chart_universe(tickers=None):
+    """Syncs the whole universe in one batch download and renders every chart across a process pool."""
+    tickers = tickers or FINANCE_UNIVERSE
+    print(f"📉 Quant Engine: Rendering {len(tickers)} charts...")
+    store = get_market_store()
+    store.sync(tickers)
+    series = {}
+    for ticker in tickers:
+        dates, closes = store.closes(ticker, CHART_DAYS)
+        if len(closes):
+            series[ticker] = (dates, closes)
+    from empire.charts import render_universe
+    return render_universe(series)
+
+def save_chart_universe(n=None):
+    """`--charts [N]`: renders the N most unusual movers (the whole universe by default) into CHART_DIR in one batch."""
+    tickers = list(FINANCE_UNIVERSE)
+    if n:
+        from empire.quant import analyze_universe, rank_tickers
+        store = get_market_store()
+        store.sync(tickers)
+        stats = analyze_universe(store.panel(tickers, ANALYTICS_DAYS, "close"), store.panel(tickers, ANALYTICS_DAYS, "volume"))
+        tickers = rank_tickers(tickers, stats)[:n]
+    charts = generate_chart_universe(tickers)
+    os.makedirs(CHART_DIR, exist_ok=True)
+    for ticker, png in charts.items():
+        with open(os.path.join(CHART_DIR, f"{ticker}.png"), "wb") as f:
+            f.write(png)
+    return charts
+
+def pick_finance_ticker(tickers=None):
+    """
+    Ranks the universe by how unusual today's move is and returns (ticker, numeric brief).
+    Falls back to a random pick without a brief if market data is unavailable.
+    """
+    tickers = list(tickers or FINANCE_UNIVERSE)
+    try:
+        from empire.quant import analyze_universe, rank_tickers, describe_ticker
+        store = get_market_store()
+        store.sync(tickers)
+        stats = analyze_universe(store.panel(tickers, ANALYTICS_DAYS, "close"), store.panel(tickers, ANALYTICS_DAYS, "volume"))
+        ticker = rank_tickers(tickers, stats)[0]
+        brief = describe_ticker(tickers, stats, ticker)
+        print(f"📊 Most unusual mover: {ticker} — {brief}")
+        return ticker, brief
+    except Exception as e:
+        print(f"⚠️ Quant ranking failed ({e}). Picking at random.")
+        return random.choice(tickers), None
+
 # --- 3. THE VISIONARY (Art) ---
+TECH_TOPICS = ["Kubernetes Clusters", "Neural Network Layers", "Rust Memory Safety"]
+MINDSET_TOPICS = ["Deep Work", "Shipping MVP", "Code Quality"]
+
+_art_pool = None
+
+def get_art_pool():
+    global _art_pool
+    if _art_pool is None:
+        from empire.art_pool import ArtPool
+        _art_pool = ArtPool(token=HF_TOKEN)
+    return _art_pool
+
+def art_prompt(topic):
+    return f"technical blueprint schematic of {topic}, isometric view, engineering diagram style, cyan lines on dark blue, 8k"
+
+def all_art_prompts():
+    return [art_prompt(t) for t in TECH_TOPICS] + [art_prompt(f"minimalist icon representing {t}") for t in MINDSET_TOPICS]
+
 def generate_architectural_art(topic):
+    """
+    Serves a pre-generated FLUX image from the art pool; if the pool is empty, renders the
+    procedural blueprint locally instead of waiting on inference.
+    """
     print(f"🎨 Rendering Schematic for: {topic}")
-    client = InferenceClient(token=HF_TOKEN)
-    base_prompt = (f"technical blueprint schematic of {topic}, isometric view, engineering diagram style, cyan lines on dark blue, 8k")
+    base_prompt = art_prompt(topic)
     try:
-        image = client.text_to_image(prompt=base_prompt, model="black-forest-labs/FLUX.1-schnell")
-        image_path = "assets_visual.png"
-        image.save(image_path)
-        print("✅ Visual Asset Created.")
-        return image_path
+        data = get_art_pool().take(base_prompt)
+        if data:
+            print("✅ Visual Asset Served from Pool.")
+        else:
+            print("⚠️ Art pool empty. Using procedural blueprint.")
+            from empire.art_pool import render_blueprint
+            data = render_blueprint(base_prompt)
+        return keep_copy(data, "assets_visual.png")
     except Exception as e:
         print(f"⚠️ Art Gen Failed: {e}")
         return None
 
-# --- 4. THE GHOSTWRITER (Gemini SDK Update) ---
-def generate_analysis_text(mode, topic):
-    
-    # 1. Configure SDK
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-    except Exception as e:
-        print(f"❌ SDK Config Error: {e}")
-        return None
+# --- 4. THE GHOSTWRITER (Gemini Gateway) ---
+def generate_analysis_text(mode, topic, brief=None, note=""):
+    # `note`: an account's profile line in multi-account runs (Account.prompt_note)
+    # 1. Shared gateway (warm client, per-model rate limits, retries)
+    llm = get_gateway()
 
     # 2. Select Prompt
     if mode == "FINANCE":
         system_prompt = f"Act as a Quant Trader. Topic: ${topic}. Analyze volatility. Style: Short, data-driven. Start with 'Market Update:'"
+        if brief:
+            system_prompt += f" DATA (use these exact numbers, do not invent others): {brief}"
     elif mode == "TECH":
         system_prompt = f"Act as a Systems Architect. Topic: {topic}. Explain the engineering value. Style: Technical."
     else:
@@ -96,86 +171,159 @@ def generate_analysis_text(mode, topic):
 
     # 3. Generate
     try:
-        response = model.generate_content(system_prompt)
-        return clean_ai_slop(response.text)
+        text = llm.generate(system_prompt + note, model='gemini-2.5-flash')
+        return clean_ai_slop(text)
     except Exception as e:
         print(f"❌ Gemini API Error: {e}")
         return None
 
-# --- 5. THE UPLINK ---
-def post_visual_asset(urn, text, image_path):
-    print("🚀 Uploading Asset to LinkedIn...")
-    reg_url = "https://api.linkedin.com/v2/assets?action=registerUpload"
-    headers = {"Authorization": f"Bearer {LINKEDIN_TOKEN}"}
-    reg_body = {
-        "registerUploadRequest": {
-            "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-            "owner": urn,
-            "serviceRelationships": [{"relationshipType": "OWNER", "identifier": "urn:li:userGeneratedContent"}]
-        }
-    }
-    
-    try:
-        reg_res = requests.post(reg_url, headers=headers, json=reg_body)
-        reg_res.raise_for_status()
-        data = reg_res.json()
-        upload_url = data['value']['uploadMechanism']['com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
-        asset_urn = data['value']['asset']
-        
-        with open(image_path, "rb") as f:
-            requests.put(upload_url, headers={"Authorization": f"Bearer {LINKEDIN_TOKEN}"}, data=f)
-            
-        pub_url = "https://api.linkedin.com/v2/ugcPosts"
-        pub_body = {
-            "author": urn,
-            "lifecycleState": "PUBLISHED",
-            "specificContent": {
-                "com.linkedin.ugc.ShareContent": {
-                    "shareCommentary": {"text": text},
-                    "shareMediaCategory": "IMAGE",
-                    "media": [{"status": "READY", "description": {"text": "AI Analysis"}, "media": asset_urn, "title": {"text": "Insight"}}]
-                }
-            },
-            "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
-        }
-        
-        requests.post(pub_url, headers=headers, json=pub_body)
-        print("✅ SUCCESS: Visual Post Deployed.")
-        
-    except Exception as e:
-        print(f"❌ Upload Sequence Failed: {e}")
-
-def get_urn():
+# --- 5. THE UPLINK (see empire/linkedin.py) ---
+def get_urn(publisher=None):
     try:
-        res = requests.get("https://api.linkedin.com/v2/userinfo", headers={"Authorization": f"Bearer {LINKEDIN_TOKEN}"})
-        return f"urn:li:person:{res.json()['sub']}"
-    except:
-        sys.exit("❌ Auth Failed")
+        return (publisher or get_publisher()).get_urn()
+    except LinkedInError as e:
+        sys.exit(f"❌ Auth Failed: {e}")
 
-if __name__ == "__main__":
-    user_urn = get_urn()
+# --- 6. THE FLIGHT PLAN (Stage Graph) ---
+def pick_assignment():
+    """Returns (mode, topic, brief); brief carries computed market stats for FINANCE, else None."""
     choice = random.choices(["FINANCE", "TECH", "MINDSET"], weights=[40, 40, 20], k=1)[0]
-    
-    asset_file = None
-    topic = ""
-    
+    brief = None
+    if choice == "FINANCE":
+        topic, brief = pick_finance_ticker()
+    elif choice == "TECH":
+        topic = random.choice(TECH_TOPICS)
+    else:
+        topic = random.choice(MINDSET_TOPICS)
+    return choice, topic, brief
+
+def render_asset(assignment):
+    choice, topic, _ = assignment
     if choice == "FINANCE":
-        topic = random.choice(["NVDA", "MSTR", "COIN", "TSLA", "AMD", "ETH-USD", "SOL-USD"])
         asset_file = generate_pro_chart(topic)
     elif choice == "TECH":
-        topic = random.choice(["Kubernetes Clusters", "Neural Network Layers", "Rust Memory Safety"])
         asset_file = generate_architectural_art(topic)
-    elif choice == "MINDSET":
-        topic = random.choice(["Deep Work", "Shipping MVP", "Code Quality"])
+    else:
         asset_file = generate_architectural_art(f"minimalist icon representing {topic}")
+    if not asset_file:
+        sys.exit("❌ Visual Generation Failed.")
+    data, report = optimize_image(asset_file)
+    print(describe(report))
+    return data   # uploaded straight from memory
 
-    if asset_file:
-        post_text = generate_analysis_text(choice, topic)
-        if post_text:
-            print(f"📝 Topic: {topic} | Mode: {choice}")
-            post_visual_asset(user_urn, post_text, asset_file)
-            if os.path.exists(asset_file): os.remove(asset_file)
-        else:
-            print("❌ Text Generation Failed.")
+def write_text(assignment, note=""):
+    choice, topic, brief = assignment
+    post_text = generate_analysis_text(choice, topic, brief, note)
+    if not post_text:
+        sys.exit("❌ Text Generation Failed.")
+    print(f"📝 Topic: {topic} | Mode: {choice}")
+    return post_text
+
+def register_stage(urn, publisher=None):
+    try:
+        return (publisher or get_publisher()).register_upload(urn)
+    except (LinkedInError, KeyError) as e:
+        sys.exit(f"❌ Upload Sequence Failed: {e}")
+
+def upload_stage(register, asset, publisher=None):
+    print("🚀 Uploading Asset to LinkedIn...")
+    try:
+        return (publisher or get_publisher()).upload(register, asset)
+    except (LinkedInError, OSError) as e:
+        sys.exit(f"❌ Upload Sequence Failed: {e}")
+
+def publish_stage(urn, text, upload, publisher=None):
+    """True once posted; False when the ledger shows the same post already went out."""
+    try:
+        (publisher or get_publisher()).publish(urn, text, upload, media_title="Insight", media_description="AI Analysis")
+    except AlreadyPublished as e:
+        print(f"↩️ {e}")
+        return False
+    except LinkedInError as e:
+        sys.exit(f"❌ Publish Failed: {e}")
+    print("✅ SUCCESS: Visual Post Deployed.")
+    return True
+
+def build_visual_pipeline(assignment=None):
+    """
+    Chart/art rendering, copywriting and asset registration all run side by side:
+    assignment → asset ─┐
+    urn → register ─────┴► upload ─┐
+    assignment → text ─────────────┴► publish
+    """
+    flow = Pipeline("visual")
+    flow.add("assignment", (lambda: assignment) if assignment else pick_assignment)
+    flow.add("urn", get_urn)
+    flow.add("asset", render_asset, deps=["assignment"])
+    flow.add("text", write_text, deps=["assignment"])
+    flow.add("register", register_stage, deps=["urn"])
+    flow.add("upload", upload_stage, deps=["register", "asset"])
+    flow.add("publish", publish_stage, deps=["urn", "text", "upload"])
+    return flow
+
+# --- 7. THE FAN-OUT (One Asset, Every Account) ---
+def isolated(account, fn, *args):
+    """Runs one account's step; its sys.exit() or error stops that account only (returns None)."""
+    try:
+        return fn(*args)
+    except SystemExit as e:
+        print(f"❌ [{account.name}] Stopped: {e.code}")
+    except Exception as e:
+        print(f"❌ [{account.name}] {type(e).__name__}: {e}")
+    return None
+
+def account_register(account):
+    publisher = account.publisher
+    urn = get_urn(publisher)
+    return urn, register_stage(urn, publisher)
+
+def account_publish(account, register, asset, text):
+    urn, registration = register
+    return publish_stage(urn, text, upload_stage(registration, asset, account.publisher), account.publisher)
+
+def publish_for(account, asset, register, text):
+    return (register is not None and text is not None
+            and bool(isolated(account, account_publish, account, register, asset, text)))
+
+def build_visual_fanout_pipeline(accounts, assignment=None):
+    """
+    The assignment and the rendered asset are made once; every account then writes its own copy,
+    registers (alongside rendering), uploads and publishes with its own token and rate limit:
+    assignment → asset ─────────┬► post:A
+    assignment → text:A ────────┤
+    A.urn → register:A ─────────┘   (same for B, C ...)
+    Account stages are prefixed, so no account name can clash with a shared stage.
+    """
+    flow = Pipeline("visual-fanout")
+    flow.add("assignment", (lambda: assignment) if assignment else pick_assignment)
+    flow.add("asset", render_asset, deps=["assignment"])
+    for account in accounts:
+        text, register = f"text:{account.name}", f"register:{account.name}"
+        flow.add(text, lambda assignment, account=account:
+                 isolated(account, write_text, assignment, account.prompt_note), deps=["assignment"])
+        flow.add(register, lambda account=account: isolated(account, account_register, account))
+        flow.add(f"post:{account.name}", lambda account=account, text=text, register=register, **results:
+                 publish_for(account, results["asset"], results[register], results[text]),
+                 deps=["asset", text, register])
+    return flow
+
+if __name__ == "__main__":
+    if "--accounts" in sys.argv:
+        # python main_empire.py --accounts : one render, one post per account in accounts.json
+        accounts = load_accounts("visual")
+        if not accounts:
+            sys.exit("❌ No account in accounts.json runs the visual engine.")
+        run = build_visual_fanout_pipeline(accounts).run(max_workers=3 * len(accounts) + 2)
+        print(f"📣 Posted to {sum(bool(run.results.get(f'post:{a.name}')) for a in accounts)}/{len(accounts)} accounts.")
+    elif "--charts" in sys.argv:
+        # python main_empire.py --charts [N] : chart pack of the N most unusual movers, no post
+        at = sys.argv.index("--charts") + 1
+        n = int(sys.argv[at]) if at < len(sys.argv) and sys.argv[at].isdigit() else None
+        charts = save_chart_universe(n)
+        print(f"📉 {len(charts)} charts written to {CHART_DIR}/: {', '.join(charts)}")
+    elif "--fill-art-pool" in sys.argv:
+        # Off the critical path: tops the pool back up after the post has gone out.
+        made = get_art_pool().fill(all_art_prompts())
+        print(f"🎨 Art pool refilled with {made} new images.")
     else:
-        print("❌ Visual Generation Failed.")
+        build_visual_pipeline().run()
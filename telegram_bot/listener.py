@@ -1,10 +1,18 @@
 import os
+import sys
 import asyncio
-import csv
+import json
 from telethon import TelegramClient
+from telethon.errors import FloodWaitError
 from telethon.sessions import StringSession
 from datetime import datetime, timedelta, timezone
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for `empire`
+from empire import telemetry
+from empire.job_store import JobStore
+from empire.job_parser import extract
+from empire.job_dedupe import LinkResolver
+
 # --- CONFIGURATION ---
 # Load secrets from GitHub Environment
 api_id = int(os.environ['TG_API_ID'])
@@ -22,50 +30,122 @@ TARGET_CHANNELS = [
     'offcampus_phodenge'
 ]
 
-async def main():
+# --- SCAN TUNING ---
+MAX_CONCURRENT_SCANS = int(os.environ.get("TG_MAX_CONCURRENT_SCANS", "8"))
+MAX_FLOOD_WAIT = int(os.environ.get("TG_MAX_FLOOD_WAIT", "300"))   # longer waits skip the channel this run
+LOOKBACK_HOURS = 24                                                 # first scan of a channel only
+CHECKPOINT_FILE = "telegram_checkpoints.json"                       # channel -> last seen message id
+
+def make_client():
+    """The Telegram connection; swapped for a stand-in by the benchmark harness (empire/benchmark.py)."""
+    return TelegramClient(StringSession(session_string), api_id, api_hash)
+
+def load_checkpoints():
+    if not os.path.exists(CHECKPOINT_FILE): return {}
+    with open(CHECKPOINT_FILE, "r") as f:
+        return json.load(f)
+
+def save_checkpoints(checkpoints):
+    tmp = CHECKPOINT_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoints, f, indent=2, sort_keys=True)
+    os.replace(tmp, CHECKPOINT_FILE)
+
+async def scan_channel(client, channel, last_id, time_limit, semaphore, on_job):
+    """
+    Reads only messages newer than `last_id` (or the last 24h on a channel's first scan).
+    Flood waits are slept out and the scan resumes after the last message handled.
+    Returns the new checkpoint id, or None if the channel could not be scanned.
+    """
+    async with semaphore:
+        print(f"Scanning: {channel}...")
+        newest = last_id or 0
+        with telemetry.span("telegram.scan", channel=channel) as span:
+            while True:
+                try:
+                    if newest:
+                        messages = client.iter_messages(channel, min_id=newest, reverse=True)
+                    else:
+                        messages = client.iter_messages(channel, offset_date=time_limit, reverse=True)
+                    async for message in messages:
+                        await on_job(channel, message)
+                        newest = max(newest, message.id)   # only once handled: a failed message is read again next run
+                    span.set(checkpoint=newest)
+                    return newest
+                except FloodWaitError as e:
+                    telemetry.count("telegram.flood_waits", channel=channel)
+                    if e.seconds > MAX_FLOOD_WAIT:
+                        print(f"   ⏳ {channel}: flood wait {e.seconds}s is too long. Skipping this run.")
+                        telemetry.event("telegram.skipped", channel=channel, flood_wait_s=e.seconds)
+                        return newest or None
+                    print(f"   ⏳ {channel}: flood wait {e.seconds}s...")
+                    await asyncio.sleep(e.seconds + 1)
+                except Exception as e:
+                    print(f"   ⚠️ Error accessing {channel}: {e}")
+                    telemetry.event("telegram.skipped", channel=channel, error=str(e)[:300])
+                    return newest or None
+
+async def scan_all(client, checkpoints, on_job):
+    """Scans every channel concurrently and moves the checkpoints forward in place."""
+    # Look back 24 hours on a channel's first scan; afterwards only messages past the checkpoint
+    time_limit = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCANS)
+
+    results = await asyncio.gather(*(
+        scan_channel(client, channel, checkpoints.get(channel), time_limit, semaphore, on_job)
+        for channel in TARGET_CHANNELS
+    ))
+    for channel, newest in zip(TARGET_CHANNELS, results):
+        if newest:
+            checkpoints[channel] = newest
+
+async def main(client=None):
+    """One scan. `client` is an already connected client to reuse (daemon.py); by default one is opened for the run."""
     print("--- 🕵️‍♂️ Recruitment Engine (Listener) Starting ---")
     
-    # 1. Prepare the CSV file
-    # This matches exactly what poster.py looks for
-    csv_filename = "jobs_data.csv"
-    
-    f = open(csv_filename, "w", newline="", encoding="utf-8")
-    writer = csv.writer(f)
-    writer.writerow(["Date", "Channel", "Raw_Text"]) # 'Raw_Text' is critical for poster.py
+    # 1. Open the job store (persistent; poster.py reads from the same file)
+    store = JobStore()
+    pruned = store.prune()
+    if pruned:
+        print(f"🧹 Pruned {pruned} stale jobs.")
     
-    async with TelegramClient(StringSession(session_string), api_id, api_hash) as client:
-        print("✅ Login Successful. Scanning channels...")
+    resolver = LinkResolver()
+    checkpoints = load_checkpoints()
+    jobs_found = 0
+
+    async def on_job(channel, message):
+        nonlocal jobs_found
+        telemetry.count("telegram.messages")
+        # Filter: only job posts with an application link survive extraction; promos and chatter return None
+        fields = extract(message.text)
+        if fields is None:
+            return
+        
+        # Shortened links are expanded (once, then cached) so the same opening matches across channels
+        if resolver.is_short(fields["apply_url"]):
+            fields["apply_url"] = await asyncio.to_thread(resolver.resolve, fields["apply_url"])
         
-        # Look back 24 hours to ensure we get fresh data
-        time_limit = datetime.now(timezone.utc) - timedelta(hours=24)
-        jobs_found = 0
+        # Re-scans, cross-posted and reworded copies are skipped by the store
+        if not store.add(channel, message.id, message.text, fields):
+            telemetry.count("jobs.duplicates")
+            return
+        telemetry.count("jobs.found")
         
-        for channel in TARGET_CHANNELS:
-            try:
-                print(f"Scanning: {channel}...")
-                async for message in client.iter_messages(channel, offset_date=time_limit, reverse=True):
-                    
-                    # Filter: Only keep messages with Links or "Apply" text
-                    if message.text and ("http" in message.text or "Apply" in message.text):
-                        
-                        # Clean newlines to keep CSV tidy
-                        clean_text = message.text.replace("\n", "  ")
-                        
-                        # Save to CSV
-                        writer.writerow([
-                            datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 
-                            channel, 
-                            clean_text
-                        ])
-                        
-                        print(f"   🎯 FOUND: {clean_text[:40]}...")
-                        jobs_found += 1
-                        
-            except Exception as e:
-                print(f"   ⚠️ Error accessing {channel}: {e}")
+        print(f"   🎯 FOUND: {fields.get('company', '?')} — {fields.get('role', '?')}")
+        jobs_found += 1
+
+    if client is None:
+        async with make_client() as client:
+            print("✅ Login Successful. Scanning channels...")
+            await scan_all(client, checkpoints, on_job)
+    else:
+        print("✅ Reusing connected client. Scanning channels...")
+        await scan_all(client, checkpoints, on_job)
 
-    f.close()
-    print(f"--- ✅ Scan Complete. Found {jobs_found} jobs. Saved to {csv_filename} ---")
+    save_checkpoints(checkpoints)
+    print(f"--- ✅ Scan Complete. Found {jobs_found} new jobs ({store.duplicates} duplicates collapsed). "
+          f"{store.count_unposted()} waiting in {store.path} ---")
+    store.close()
 
 if __name__ == '__main__':
     asyncio.run(main())
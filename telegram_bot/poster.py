@@ -1,107 +1,126 @@
-import pandas as pd
 import os
 import random
-import requests
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for `empire`
+from empire import telemetry
+from empire.llm import get_gateway
+from empire.linkedin import get_publisher, LinkedInError, AlreadyPublished
+from empire.publish_queue import PublishQueue, PUBLISH_QUEUE_DB
+from empire.accounts import accounts_configured, load_accounts
+# JobStore / job_parser are imported where jobs are read, so a --drain run stays light
 
 # --- CONFIGURATION ---
-LINKEDIN_TOKEN = os.environ["LINKEDIN_ACCESS_TOKEN"]
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-
-def get_user_urn():
-    """Get your LinkedIn ID (URN)"""
-    url = "https://api.linkedin.com/v2/userinfo"
-    headers = {"Authorization": f"Bearer {LINKEDIN_TOKEN}"}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return f"urn:li:person:{response.json()['sub']}"
-    print(f"❌ LinkedIn Error: {response.text}")
+LINKEDIN_TOKEN = os.environ.get("LINKEDIN_ACCESS_TOKEN")
+POST_MODEL = "gemini-1.5-flash"
+DRAIN_LIMIT = int(os.environ.get("DRAIN_LIMIT", "1"))   # posts published per drain run (per account)
+
+if not (LINKEDIN_TOKEN or accounts_configured()):
+    print("❌ LINKEDIN_ACCESS_TOKEN is not set (and there is no accounts.json).")
     sys.exit(1)
 
-def generate_viral_post(raw_job_text):
-    """Uses Gemini to turn raw spammy text into a professional post"""
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
-    
-    prompt = f"""
+def get_user_urn(publisher=None):
+    """Get your LinkedIn ID (URN), cached on disk between runs"""
+    try:
+        return (publisher or get_publisher()).get_urn()
+    except LinkedInError as e:
+        print(f"❌ LinkedIn Error: {e}")
+        sys.exit(1)
+
+def build_post_prompt(fields, note=""):
+    """The Gemini prompt for one job, built from its extracted fields only (plus an account's profile `note`)"""
+    from empire.job_parser import to_prompt
+    return f"""
     You are a Tech Recruiter influencer. 
-    Turn this raw job alert into a professional, engaging LinkedIn post.
+    Turn this job alert into a professional, engaging LinkedIn post.
+    Use only the facts below; leave out anything that is not listed.
     
-    RAW DATA:
-    "{raw_job_text[:1000]}"
+    JOB DETAILS:
+    {to_prompt(fields)}
     
     RULES:
     1. Headline: Use a catchy Hook (e.g., "🚨 Qualcomm is Hiring Freshers!").
     2. Formatting: Use bullet points for Role, Batch, Salary (if available).
     3. Tone: Helpful, urgent, and professional. No cringe emojis.
-    4. Call to Action: "Link in comments 👇" (Note: The API can't comment, so put the link in the post body for now).
+    4. Call to Action: "Link in comments 👇" (Note: The API can't comment, so put the Apply Url in the post body for now).
     5. Hashtags: Add 3 relevant tags (e.g., #Freshers #Qualcomm #Hiring).
     
     OUTPUT ONLY THE POST TEXT.
-    """
-    
-    payload = {"contents": [{"parts": [{"text": prompt}]}]}
-    response = requests.post(url, json=payload)
-    
-    if response.status_code == 200:
-        return response.json()['candidates'][0]['content']['parts'][0]['text']
-    return None
-
-def post_to_linkedin(urn, content):
-    url = "https://api.linkedin.com/v2/ugcPosts"
-    headers = {
-        "Authorization": f"Bearer {LINKEDIN_TOKEN}",
-        "Content-Type": "application/json",
-        "X-Restli-Protocol-Version": "2.0.0"
-    }
-    
-    payload = {
-        "author": urn,
-        "lifecycleState": "PUBLISHED",
-        "specificContent": {
-            "com.linkedin.ugc.ShareContent": {
-                "shareCommentary": {"text": content},
-                "shareMediaCategory": "NONE"
-            }
-        },
-        "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
-    }
-    
-    response = requests.post(url, headers=headers, json=payload)
-    if response.status_code == 201:
-        print("✅ Success! Job posted to LinkedIn.")
-    else:
-        print(f"❌ Failed to post: {response.text}")
+    """ + note
 
-def main():
-    print("--- 🚀 Job Poster Engine Starting ---")
-    
-    # 1. Load the CSV
+def generate_viral_post(fields):
+    """Uses Gemini to turn the extracted job fields into a professional post"""
     try:
-        df = pd.read_csv("jobs_data.csv")
-    except FileNotFoundError:
-        print("⚠️ No jobs_data.csv found. Run listener.py first.")
-        return
+        return get_gateway().generate(build_post_prompt(fields), model=POST_MODEL)
+    except Exception as e:
+        print(f"❌ Gemini Error: {e}")
+        return None
 
-    if df.empty:
-        print("⚠️ CSV is empty. No jobs to post.")
-        return
+def post_to_linkedin(urn, content, publisher=None, key=None):
+    """True once posted, False on failure, None when the ledger shows this post (`key`) already went out."""
+    try:
+        (publisher or get_publisher()).publish(urn, content, key=key)
+    except AlreadyPublished as e:
+        print(f"↩️ {e}")
+        return None
+    except LinkedInError as e:
+        print(f"❌ Failed to post: {e}")
+        return False
+    print("✅ Success! Job posted to LinkedIn.")
+    return True
+
+def job_fields(store, job):
+    """Extracted fields for a stored job; None (and the job retired) if it turns out not to be a job."""
+    from empire.job_parser import extract
+    fields = job['fields'] or extract(job['raw_text'])   # rows stored before extraction have no fields
+    if not fields:
+        print("⚠️ Selected post is not a job. Skipping it for good.")
+        store.mark_posted(job['id'])
+    return fields
+
+def pick_jobs(store, n, account=None):
+    """Up to n distinct random unposted jobs (not yet posted by `account`, if given) as (job, fields)."""
+    picked, seen = [], set()
+    for _ in range(n * 3):
+        if len(picked) == n:
+            break
+        job = store.sample_unposted(account=account)
+        if job is None:
+            break
+        if job['id'] in seen:
+            continue
+        seen.add(job['id'])
+        fields = job_fields(store, job)
+        if fields:
+            picked.append((job, fields))
+    return picked
 
-    # 2. Filter for meaningful rows (ignore raw errors)
-    # We just take a random job from the file
-    # (Since the file is rewritten every run, these are all 'new' jobs)
+def run_single():
+    """One job, generated and posted right away (the original mode)."""
+    from empire.job_store import JobStore
     
-    print(f"📊 Found {len(df)} jobs in CSV.")
+    # 1. Open the job store filled by listener.py
+    store = JobStore()
+    waiting = store.count_unposted()
+    if not waiting:
+        print("⚠️ No unposted jobs. Run listener.py first.")
+        return
+
+    print(f"📊 Found {waiting} unposted jobs.")
     
-    # Pick 1 random job to avoid spamming (or loop if you want multiple)
-    # Let's pick a random one
-    job_row = df.sample(1).iloc[0]
-    raw_text = job_row['Raw_Text']
+    # 2. Pick 1 random unposted job to avoid spamming (one index probe, nothing loaded into memory)
+    picked = pick_jobs(store, 1)
+    if not picked:
+        return
+    job, fields = picked[0]
     
-    print(f"🎯 Selected Job: {raw_text[:50]}...")
+    print(f"🎯 Selected Job: {fields.get('company', '?')} — {fields.get('role', '?')}")
     
     # 3. Generate Content
-    post_content = generate_viral_post(raw_text)
+    post_content = generate_viral_post(fields)
     
     if post_content:
         print("\n--- Generated Post ---")
@@ -110,9 +129,177 @@ def main():
         
         # 4. Post to LinkedIn
         urn = get_user_urn()
-        post_to_linkedin(urn, post_content)
+        if post_to_linkedin(urn, post_content):
+            store.mark_posted(job['id'])
     else:
         print("❌ AI failed to generate post.")
 
+def run_batch(n):
+    """
+    Generates n posts with concurrent Gemini calls and schedules them in the publish queue,
+    POST_INTERVAL_MINUTES apart. Queued jobs are marked posted so no later batch picks them again;
+    a post LinkedIn rejects outright hands its job back once the drain gives up on it (release_job).
+    """
+    from empire.job_store import JobStore
+    store = JobStore()
+    picked = pick_jobs(store, n)
+    if not picked:
+        print("⚠️ No unposted jobs. Run listener.py first.")
+        return
+
+    print(f"🧠 Generating {len(picked)} posts...")
+    with telemetry.span("poster.generate", posts=len(picked)):
+        texts = get_gateway().generate_many([build_post_prompt(fields) for _, fields in picked], model=POST_MODEL)
+    ready = []
+    for (job, fields), text in zip(picked, texts):
+        if isinstance(text, Exception) or not text:
+            print(f"❌ Gemini Error for {fields.get('company', '?')}: {text}")
+            continue
+        ready.append((job, {"text": text, "job_id": job['id'], "company": fields.get('company'), "role": fields.get('role')}))
+
+    queue = PublishQueue()
+    scheduled = queue.enqueue_many("jobs", [payload for _, payload in ready])
+    for (job, payload), (item_id, due_at) in zip(ready, scheduled):
+        store.mark_posted(job['id'])
+        print(f"🗓️ #{item_id} {payload['company'] or '?'} — {payload['role'] or '?'} at {time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(due_at))}")
+    print(f"📬 {len(scheduled)} posts queued ({queue.pending_count()} pending in {queue.path}).")
+
+def run_batch_accounts(n, accounts):
+    """
+    run_batch() for several accounts: each picks up to n jobs it has not posted, every account's posts
+    (in its own voice) are generated together in one generate_many() call, and each account schedules
+    into its own queue. Job extraction is shared: a job picked by several accounts is parsed once.
+    """
+    from empire.job_store import JobStore
+    store = JobStore()
+    picks = {account.name: pick_jobs(store, n, account.namespace) for account in accounts}
+    wanted = [(account, job, fields) for account in accounts for job, fields in picks[account.name]]
+    if not wanted:
+        print("⚠️ No unposted jobs for any account. Run listener.py first.")
+        return
+
+    print(f"🧠 Generating {len(wanted)} posts for {len(accounts)} accounts...")
+    with telemetry.span("poster.generate", posts=len(wanted), accounts=len(accounts)):
+        prompts = [build_post_prompt(fields, account.prompt_note) for account, _, fields in wanted]
+        results = get_gateway().generate_many(prompts, model=POST_MODEL)
+    texts = {}
+    for (account, job, fields), text in zip(wanted, results):
+        if isinstance(text, Exception) or not text:
+            print(f"❌ [{account.name}] Gemini Error for {fields.get('company', '?')}: {text}")
+        else:
+            texts[(account.name, job['id'])] = text
+
+    for account in accounts:
+        ready = [(job, {"text": texts[(account.name, job['id'])], "job_id": job['id'],
+                        "company": fields.get('company'), "role": fields.get('role')})
+                 for job, fields in picks[account.name] if (account.name, job['id']) in texts]
+        queue = PublishQueue(account.path(PUBLISH_QUEUE_DB))
+        scheduled = queue.enqueue_many("jobs", [payload for _, payload in ready])
+        for job, _ in ready:
+            store.mark_posted(job['id'], account=account.namespace)
+        print(f"📬 [{account.name}] {len(scheduled)} posts queued ({queue.pending_count()} pending in {queue.path}).")
+
+def is_rejection(error):
+    """A definite 4xx answer to the POST: nothing went out. Ledger blocks and 5xx/timeouts may have posted."""
+    return error.status is not None and 400 <= error.status < 500 and error.status != 429
+
+def release_job(item, account=None):
+    """
+    Returns a rejected post's job to the pool, so a later batch can try it again.
+    Plain SQLite (dedupe=False: no numpy), and a failure is logged rather than stopping the drain.
+    """
+    job_id = item['payload'].get('job_id')
+    if job_id is None:
+        return False
+    try:
+        from empire.job_store import JobStore
+        store = JobStore(dedupe=False)
+        try:
+            store.unmark_posted(job_id, account=account.namespace if account else None)
+        finally:
+            store.close()
+    except Exception as e:
+        print(f"⚠️ Could not return job {job_id} to the pool: {type(e).__name__}: {e}")
+        return False
+    return True
+
+def run_drain(limit=DRAIN_LIMIT, account=None):
+    """
+    Publishes queued posts whose time has come. No LLM, and the job store only when a post is given up on:
+    just the queue and LinkedIn. With `account`: that account's queue, token and rate limit.
+    """
+    queue = PublishQueue(account.path(PUBLISH_QUEUE_DB)) if account else PublishQueue()
+    publisher = account.publisher if account else None
+    tag = f"[{account.name}] " if account else ""
+    items = queue.due(limit)
+    if not items:
+        print(f"💤 {tag}Nothing due ({queue.pending_count()} pending).")
+        return
+
+    urn = get_user_urn(publisher)
+    for item in items:
+        print(f"🚀 {tag}Publishing #{item['id']}: {item['payload'].get('company') or '?'} — {item['payload'].get('role') or '?'}")
+        with telemetry.span("poster.publish", item=item['id']):
+            # Keyed by the queue item (created_at guards against ids reused by a fresh queue file): a retried
+            # item never posts twice, and two queued jobs with the same text are still two posts
+            key = f"queue:{item['id']}:{item['created_at']}"
+            try:
+                (publisher or get_publisher()).publish(urn, item['payload']['text'], key=key)
+            except AlreadyPublished as e:
+                print(f"↩️ {e}")
+                queue.mark_published(item['id'])   # an earlier attempt already posted it
+                continue
+            except LinkedInError as e:
+                print(f"❌ Failed to post: {e}")
+                error = e
+            else:
+                print("✅ Success! Job posted to LinkedIn.")
+                queue.mark_published(item['id'])
+                continue
+        if queue.mark_failed(item['id'], error):
+            print("🔁 Will retry later.")
+        elif not is_rejection(error):
+            # May be live already: the job stays retired until someone checks (python -m empire.linkedin unresolved)
+            print("🛑 Giving up on this post. It may have gone out, so its job stays marked posted.")
+        elif release_job(item, account):
+            print("🛑 Giving up on this post; LinkedIn rejected it, so its job is back in the pool.")
+        else:
+            print("🛑 Giving up on this post.")
+
+def run_drain_accounts(accounts, limit=DRAIN_LIMIT):
+    """Drains every account's queue at once; each is paced by its own rate limit, and one failing account stops only itself."""
+    def drain(account):
+        try:
+            run_drain(limit, account)
+        except SystemExit as e:
+            print(f"❌ [{account.name}] Stopped: {e.code}")
+        except Exception as e:
+            print(f"❌ [{account.name}] {type(e).__name__}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, len(accounts)), thread_name_prefix="drain") as pool:
+        list(pool.map(drain, accounts))
+
+def main():
+    print("--- 🚀 Job Poster Engine Starting ---")
+    # python telegram_bot/poster.py [--batch N] [--drain] [--accounts]
+    args = sys.argv[1:]
+    accounts = load_accounts("jobs") if "--accounts" in args else None
+    if "--batch" in args:
+        with telemetry.span("poster.batch"):
+            n = int(args[args.index("--batch") + 1])
+            if accounts is not None:
+                run_batch_accounts(n, accounts)
+            else:
+                run_batch(n)
+    if "--drain" in args:
+        with telemetry.span("poster.drain"):
+            if accounts is not None:
+                run_drain_accounts(accounts)
+            else:
+                run_drain()
+    if "--batch" not in args and "--drain" not in args:
+        with telemetry.span("poster.single"):
+            run_single()
+
 if __name__ == "__main__":
     main()